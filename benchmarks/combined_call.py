@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Combined Call Benchmark
+
+Compares the two ways task_11 turns a transcript into a summary and topic
+list: the default two-call flow (summarize_transcript + extract_analytics,
+each sending the full transcript) and the combined mode
+(summarize_and_extract_topics, one structured-output call). Reports latency
+percentiles, prompt/completion tokens and the estimated cost per transcript
+across transcript lengths.
+
+By default the calls go to the local fake server, with latency growing with
+the prompt and completion token counts like a real model; `--live` uses the
+real API (OPENAI_API_KEY / OPENAI_BASE_URL) and costs money.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import contextlib
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, BENCH_DIR)
+
+from fake_openai_server import FakeOpenAIServer, ServerConfig, generate_transcript
+from run_benchmarks import load_tool_module, percentile
+
+
+def run_mode(transcriber, mode, transcript):
+    """Produce summary and analytics for one transcript; returns True on success."""
+    if mode == "combined":
+        summary, topics = transcriber.summarize_and_extract_topics(transcript)
+        if not summary:
+            return False
+        transcriber.build_analytics(transcript, topics)
+        return True
+    summary = transcriber.summarize_transcript(transcript)
+    if not summary:
+        return False
+    transcriber.extract_analytics(transcript)
+    return True
+
+
+def bench_mode(transcriber, mode, transcript, iterations, input_price, output_price):
+    """Time `iterations` runs of one mode and total the tokens from the tracer spans."""
+    tracer = transcriber.tracer
+    latencies = []
+    prompt_tokens = completion_tokens = calls = errors = 0
+    for _ in range(iterations):
+        tracer.clear()
+        start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            ok = run_mode(transcriber, mode, transcript)
+        latencies.append((time.perf_counter() - start) * 1000)
+        errors += not ok
+        for span in tracer.spans:
+            calls += 1
+            prompt_tokens += span.attributes.get("prompt_tokens", 0)
+            completion_tokens += span.attributes.get("completion_tokens", 0)
+
+    prompt_tokens /= iterations
+    completion_tokens /= iterations
+    return {
+        "mode": mode,
+        "calls": calls / iterations,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "prompt_tokens": round(prompt_tokens, 1),
+        "completion_tokens": round(completion_tokens, 1),
+        "cost_usd": (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000,
+        "errors": errors,
+    }
+
+
+def main():
+    """Run the comparison."""
+    parser = argparse.ArgumentParser(description="Compare the two-call and combined summary/topics flows")
+    parser.add_argument('--transcript-words', nargs='+', type=int, default=[500, 2000, 8000],
+                        help='Transcript lengths in words (default: 500 2000 8000)')
+    parser.add_argument('--iterations', type=int, default=5, help='Runs per mode and length (default: 5)')
+    parser.add_argument('--input-price', type=float, default=0.40,
+                        help='USD per 1M prompt tokens (default: 0.40, gpt-4.1-mini)')
+    parser.add_argument('--output-price', type=float, default=1.60,
+                        help='USD per 1M completion tokens (default: 1.60, gpt-4.1-mini)')
+    parser.add_argument('--latency-ms', type=float, default=300.0,
+                        help='Fake server base latency per request in ms (default: 300)')
+    parser.add_argument('--prompt-ms-per-1k-tokens', type=float, default=20.0,
+                        help='Fake server latency per 1000 prompt tokens in ms (default: 20)')
+    parser.add_argument('--completion-ms-per-token', type=float, default=12.0,
+                        help='Fake server latency per completion token in ms (default: 12)')
+    parser.add_argument('--live', action='store_true', help='Call the real API instead of the fake server')
+    parser.add_argument('--json', dest='json_output', help='Write the results to this JSON file')
+
+    args = parser.parse_args()
+
+    server = None
+    if not args.live:
+        config = ServerConfig(latency_ms=args.latency_ms, jitter_ms=args.latency_ms / 10, seed=0,
+                              prompt_ms_per_1k_tokens=args.prompt_ms_per_1k_tokens,
+                              completion_ms_per_token=args.completion_ms_per_token)
+        server = FakeOpenAIServer(config=config).start()
+        os.environ["OPENAI_BASE_URL"] = server.base_url
+        os.environ["OPENAI_API_KEY"] = "fake-benchmark-key"
+
+    module = load_tool_module("task_11", "main.py", "bench_combined_main")
+    tracer = module.Tracer(enabled=True)
+    transcriber = module.AudioTranscriber(tracer=tracer)
+
+    results = []
+    try:
+        print(f"{'Words':>6} {'Mode':<9} {'Calls':>5} {'p50 ms':>9} {'p95 ms':>9} "
+              f"{'Prompt tok':>10} {'Compl tok':>10} {'Cost $':>10}")
+        print("-" * 75)
+        for words in args.transcript_words:
+            transcript = generate_transcript(words)
+            rows = {}
+            for mode in ("two-call", "combined"):
+                row = bench_mode(transcriber, mode, transcript, args.iterations,
+                                 args.input_price, args.output_price)
+                row["transcript_words"] = words
+                rows[mode] = row
+                results.append(row)
+                print(f"{words:>6} {mode:<9} {row['calls']:>5.1f} {row['p50_ms']:>9.1f} {row['p95_ms']:>9.1f} "
+                      f"{row['prompt_tokens']:>10.0f} {row['completion_tokens']:>10.0f} {row['cost_usd']:>10.6f}"
+                      + (f"  ({row['errors']} failed)" if row['errors'] else ""))
+
+            two_call, combined = rows["two-call"], rows["combined"]
+            if two_call["cost_usd"] and two_call["p50_ms"]:
+                print(f"{'':>6} {'change':<9} {'':>5} {combined['p50_ms'] / two_call['p50_ms'] - 1:>+9.0%} {'':>9} "
+                      f"{combined['prompt_tokens'] / two_call['prompt_tokens'] - 1:>+10.0%} "
+                      f"{'':>10} {combined['cost_usd'] / two_call['cost_usd'] - 1:>+10.0%}")
+    finally:
+        if server is not None:
+            server.stop()
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {args.json_output}")
+
+
+if __name__ == "__main__":
+    main()
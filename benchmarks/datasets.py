@@ -0,0 +1,57 @@
+"""
+Synthetic datasets for the benchmarks.
+
+Generates product catalogs in the same format as task_10/products.json,
+at any size, deterministically from a seed.
+"""
+
+import json
+import random
+
+CATEGORY_ITEMS = {
+    "Electronics": ["Headphones", "Laptop", "Smart Watch", "Speaker", "Monitor", "Smartphone",
+                    "Mouse", "Keyboard", "Tablet", "Camera"],
+    "Fitness": ["Yoga Mat", "Dumbbells", "Resistance Bands", "Treadmill", "Jump Rope",
+                "Foam Roller", "Kettlebell", "Exercise Bike"],
+    "Kitchen": ["Blender", "Air Fryer", "Coffee Maker", "Toaster", "Knife Set", "Rice Cooker",
+                "Electric Kettle", "Cookware Set"],
+    "Books": ["Programming Guide", "Mystery Novel", "Cookbook", "Biography", "Science Fiction Novel",
+              "History Book", "Self-Help Book"],
+    "Clothing": ["T-Shirt", "Jeans", "Running Shoes", "Jacket", "Dress", "Sweater", "Hat"],
+}
+
+ADJECTIVES = ["Wireless", "Premium", "Compact", "Smart", "Portable", "Classic", "Pro", "Eco",
+              "Ultra", "Deluxe", "Gaming", "Noise-Cancelling", "Organic", "Vintage"]
+
+PRICE_RANGES = {
+    "Electronics": (19.99, 1999.99),
+    "Fitness": (9.99, 999.99),
+    "Kitchen": (9.99, 499.99),
+    "Books": (4.99, 59.99),
+    "Clothing": (9.99, 299.99),
+}
+
+
+def generate_catalog(size, seed=42):
+    """Return a list of `size` product dicts."""
+    rng = random.Random(seed)
+    categories = list(CATEGORY_ITEMS)
+    products = []
+    for i in range(size):
+        category = categories[rng.randrange(len(categories))]
+        low, high = PRICE_RANGES[category]
+        products.append({
+            "name": f"{rng.choice(ADJECTIVES)} {rng.choice(CATEGORY_ITEMS[category])} {i}",
+            "category": category,
+            "price": round(rng.uniform(low, high), 2),
+            "rating": round(rng.uniform(3.0, 5.0), 1),
+            "in_stock": rng.random() < 0.8,
+        })
+    return products
+
+
+def write_catalog(path, size, seed=42):
+    """Generate a catalog and write it as JSON to `path`."""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(generate_catalog(size, seed), f)
+    return path
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Fake OpenAI Server
+
+A local stand-in for the parts of the OpenAI API used by the console tools:
+chat completions (plain, function calling and JSON-schema structured output)
+and audio transcriptions. Latency, error rate and rate limiting (429) are
+configurable, so the tools can be benchmarked without spending API credits.
+
+Point a tool at it with:
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=fake python main.py audio.mp3
+"""
+
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+CATEGORIES = ["Electronics", "Fitness", "Kitchen", "Books", "Clothing"]
+
+TRANSCRIPT_VOCABULARY = (
+    "customer onboarding roadmap integration feedback release pipeline "
+    "team quarter budget metrics design review support launch market "
+    "the a and to of we our this that will is for with on it"
+).split()
+
+TOPICS = ["Customer Onboarding", "Q4 Roadmap", "AI Integration", "Team Budget", "Product Launch"]
+
+
+class ServerConfig:
+    """Runtime knobs of the fake server; can be changed while it is running."""
+
+    def __init__(self, latency_ms=50.0, jitter_ms=10.0, error_rate=0.0,
+                 rate_limit_rate=0.0, transcript_words=1000, report_words=800, seed=None,
+                 prompt_ms_per_1k_tokens=0.0, completion_ms_per_token=0.0):
+        self.latency_ms = latency_ms
+        # Chat completions additionally take time proportional to their token counts
+        self.prompt_ms_per_1k_tokens = prompt_ms_per_1k_tokens
+        self.completion_ms_per_token = completion_ms_per_token
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.transcript_words = transcript_words
+        self.report_words = report_words
+        self.random = random.Random(seed)
+
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token)."""
+    return max(1, len(text) // 4)
+
+
+def generate_transcript(word_count):
+    """Deterministic pseudo-transcript of the requested length."""
+    words = [TRANSCRIPT_VOCABULARY[(i * 7) % len(TRANSCRIPT_VOCABULARY)] for i in range(word_count)]
+    sentences = [" ".join(words[i:i + 15]).capitalize() + "." for i in range(0, len(words), 15)]
+    return " ".join(sentences)
+
+
+def generate_report(word_count):
+    """Markdown report with the same section layout as the service analyzer prompt."""
+    sections = ["Brief History", "Target Audience", "Core Features", "Unique Selling Points",
+                "Business Model", "Tech Stack Insights", "Perceived Strengths", "Perceived Weaknesses"]
+    per_section = max(1, word_count // len(sections))
+    body = " ".join(TRANSCRIPT_VOCABULARY[i % len(TRANSCRIPT_VOCABULARY)] for i in range(per_section))
+    return "\n\n".join(f"## {section}\n\n- {body}" for section in sections)
+
+
+def extract_search_arguments(query):
+    """Very small heuristic stand-in for the model's criteria extraction."""
+    lowered = query.lower()
+    args = {}
+
+    for category in CATEGORIES:
+        if category.lower() in lowered:
+            args["category"] = category
+            break
+
+    price = re.search(r'(?:under|below|less than)\s*\$?(\d+(?:\.\d+)?)', lowered)
+    if price:
+        args["max_price"] = float(price.group(1))
+
+    rating = re.search(r'rating (?:above|over|of at least)\s*(\d(?:\.\d+)?)', lowered)
+    if rating:
+        args["min_rating"] = float(rating.group(1))
+
+    if "in stock" in lowered:
+        args["in_stock_only"] = True
+    if "cheapest" in lowered:
+        args["find_extreme"] = "cheapest"
+    elif "most expensive" in lowered:
+        args["find_extreme"] = "most_expensive"
+    elif "highest rat" in lowered:
+        args["find_extreme"] = "highest_rating"
+    elif "lowest rat" in lowered:
+        args["find_extreme"] = "lowest_rating"
+
+    return args
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the faked endpoints."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes; without TCP_NODELAY, Nagle's
+    # algorithm and the client's delayed ACK add ~40 ms to every response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Keep benchmark output clean
+        pass
+
+    @property
+    def config(self):
+        return self.server.config
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_text(self, status, text):
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def simulate_conditions(self):
+        """Sleep for the configured latency and maybe inject a failure. Returns True if handled."""
+        config = self.config
+        with self.server.lock:
+            delay = max(0.0, config.latency_ms + config.random.uniform(-config.jitter_ms, config.jitter_ms))
+            roll = config.random.random()
+        time.sleep(delay / 1000)
+
+        if roll < config.rate_limit_rate:
+            self.server.count("rate_limited")
+            self.send_json(429, {"error": {"message": "Rate limit reached", "type": "requests",
+                                           "code": "rate_limit_exceeded"}},
+                           headers={"Retry-After": "0", "retry-after-ms": "10"})
+            return True
+        if roll < config.rate_limit_rate + config.error_rate:
+            self.server.count("errors")
+            self.send_json(500, {"error": {"message": "Injected server error", "type": "server_error"}})
+            return True
+        return False
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        raw = self.rfile.read(length) if length else b""
+        self.server.count("requests")
+
+        if self.simulate_conditions():
+            return
+
+        path = self.path.split("?")[0].rstrip("/")
+        if path.endswith("/chat/completions"):
+            self.handle_chat(json.loads(raw or b"{}"))
+        elif path.endswith("/audio/transcriptions"):
+            self.handle_transcription(raw)
+        else:
+            self.send_json(404, {"error": {"message": f"Unknown endpoint {self.path}"}})
+
+    def handle_transcription(self, raw):
+        transcript = generate_transcript(self.config.transcript_words)
+        if b'name="response_format"\r\n\r\ntext' in raw:
+            self.send_text(200, transcript)
+        else:
+            self.send_json(200, {"text": transcript})
+
+    def handle_chat(self, request):
+        messages = request.get("messages", [])
+        system = next((m["content"] for m in messages if m.get("role") == "system"), "")
+        user = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+
+        message = {"role": "assistant", "content": None}
+        response_format = request.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            # Structured output: fill the schema's properties from the usual canned answers
+            properties = response_format["json_schema"]["schema"].get("properties", {})
+            result = {}
+            for name, schema in properties.items():
+                if schema.get("type") == "array":
+                    result[name] = [{"topic": t, "mentions": 6 - i} for i, t in enumerate(TOPICS)]
+                else:
+                    result[name] = generate_report(min(self.config.report_words, 300))
+            message["content"] = json.dumps(result)
+            completion_text = message["content"]
+        elif request.get("functions"):
+            function = request["functions"][0]
+            message["function_call"] = {
+                "name": function["name"],
+                "arguments": json.dumps(extract_search_arguments(user)),
+            }
+            completion_text = message["function_call"]["arguments"]
+        elif "JSON array" in system:
+            topics = [{"topic": t, "mentions": 6 - i} for i, t in enumerate(TOPICS)]
+            message["content"] = json.dumps(topics)
+            completion_text = message["content"]
+        elif "summar" in system.lower():
+            message["content"] = generate_report(min(self.config.report_words, 300))
+            completion_text = message["content"]
+        else:
+            message["content"] = generate_report(self.config.report_words)
+            completion_text = message["content"]
+
+        completion_tokens = estimate_tokens(completion_text)
+        generation_ms = (prompt_tokens / 1000 * self.config.prompt_ms_per_1k_tokens
+                         + completion_tokens * self.config.completion_ms_per_token)
+        if generation_ms:
+            time.sleep(generation_ms / 1000)
+        self.send_json(200, {
+            "id": f"chatcmpl-fake-{self.server.total('requests')}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "gpt-4.1-mini"),
+            "choices": [{
+                "index": 0,
+                "message": message,
+                "finish_reason": "function_call" if message.get("function_call") else "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Threaded HTTP server that can run in a background thread of a benchmark."""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, config=None):
+        super().__init__((host, port), FakeOpenAIHandler)
+        self.config = config or ServerConfig()
+        self.lock = threading.Lock()
+        self.counters = {"requests": 0, "errors": 0, "rate_limited": 0}
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def count(self, name):
+        with self.lock:
+            self.counters[name] += 1
+
+    def total(self, name):
+        with self.lock:
+            return self.counters[name]
+
+    def start(self):
+        """Serve in a daemon thread and return self."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    """Run the fake server in the foreground."""
+    parser = argparse.ArgumentParser(description="Local fake OpenAI API server for benchmarking")
+    parser.add_argument('--host', default='127.0.0.1', help='Host to bind (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Port to bind (default: 8765)')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Mean response latency in ms')
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help='Uniform latency jitter in ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--transcript-words', type=int, default=1000, help='Words per generated transcript')
+    parser.add_argument('--prompt-ms-per-1k-tokens', type=float, default=0.0,
+                        help='Extra chat latency per 1000 prompt tokens in ms')
+    parser.add_argument('--completion-ms-per-token', type=float, default=0.0,
+                        help='Extra chat latency per completion token in ms')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible runs')
+
+    args = parser.parse_args()
+
+    config = ServerConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate,
+                          transcript_words=args.transcript_words, seed=args.seed,
+                          prompt_ms_per_1k_tokens=args.prompt_ms_per_1k_tokens,
+                          completion_ms_per_token=args.completion_ms_per_token)
+    server = FakeOpenAIServer(args.host, args.port, config)
+    print(f"Fake OpenAI server listening on {server.base_url}")
+    print(f"Use: OPENAI_BASE_URL={server.base_url} OPENAI_API_KEY=fake")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopping fake server.")
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
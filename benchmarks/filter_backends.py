@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Filter Backend Benchmark
+
+Compares ProductSearchTool.filter_products on the pure-Python path against
+the NumPy backend (task_10/numpy_filter.py) on synthetic catalogs, and
+checks that both return exactly the same products in the same order.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+TASK_DIR = os.path.join(os.path.dirname(BENCH_DIR), "task_10")
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, TASK_DIR)
+
+from datasets import generate_catalog
+
+CRITERIA = [
+    {"category": "Electronics", "max_price": 500, "min_rating": 4.5},
+    {"category": "Fitness", "in_stock_only": True, "sort_by": "price_asc", "limit": 10},
+    {"max_price": 100, "sort_by": "rating_desc"},
+    {"min_rating": 4.8, "sort_by": "name_asc", "limit": 25},
+    {"keywords": ["wireless"], "category": "Electronics", "in_stock_only": True},
+    {"find_extreme": "cheapest", "category": "Kitchen"},
+    {"find_extreme": "highest_rating", "in_stock_only": True},
+]
+
+
+def best_of(func, repeat):
+    """Best wall time in ms over `repeat` calls, plus the last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best, result
+
+
+def make_tool(catalog, backend):
+    """Create a ProductSearchTool (result cache off) and swap in the generated catalog."""
+    from product_search import ProductSearchTool
+
+    os.environ.setdefault("OPENAI_API_KEY", "benchmark")
+    with tempfile.NamedTemporaryFile('w', suffix=".json", delete=False) as f:
+        json.dump([], f)
+    try:
+        tool = ProductSearchTool(f.name, backend=backend, cache_size=0)
+    finally:
+        os.remove(f.name)
+
+    tool.products = catalog  # rebuilds the backend's engine
+    return tool
+
+
+def main():
+    """Run the backend comparison."""
+    parser = argparse.ArgumentParser(description="Compare the Python and NumPy filter backends")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[10_000, 1_000_000, 10_000_000],
+                        help='Catalog sizes (default: 10000 1000000 10000000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per query; the best is reported')
+    parser.add_argument('--json', dest='json_output', help='Write the results to this JSON file')
+
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        print(f"\nGenerating catalog with {size:,} products...")
+        catalog = generate_catalog(size)
+        python_tool = make_tool(catalog, "python")
+
+        start = time.perf_counter()
+        numpy_tool = make_tool(catalog, "numpy")
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"NumPy engine built in {build_ms:.1f} ms")
+
+        print(f"{'Criteria':<72} {'Python ms':>10} {'NumPy ms':>10} {'Speedup':>8}")
+        print("-" * 104)
+        for criteria in CRITERIA:
+            python_ms, expected = best_of(lambda: python_tool.filter_products(criteria), args.repeat)
+            numpy_ms, actual = best_of(lambda: numpy_tool.filter_products(criteria), args.repeat)
+
+            if len(expected) != len(actual) or any(a is not b for a, b in zip(expected, actual)):
+                print(f"MISMATCH for {criteria}: python={len(expected)} numpy={len(actual)} rows")
+                sys.exit(1)
+
+            speedup = python_ms / numpy_ms if numpy_ms else float("inf")
+            label = json.dumps(criteria)
+            print(f"{label[:72]:<72} {python_ms:>10.2f} {numpy_ms:>10.2f} {speedup:>7.1f}x")
+            results.append({"size": size, "criteria": criteria, "rows": len(expected),
+                            "python_ms": round(python_ms, 3), "numpy_ms": round(numpy_ms, 3),
+                            "numpy_build_ms": round(build_ms, 3)})
+
+        del catalog, python_tool, numpy_tool
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {args.json_output}")
+
+
+if __name__ == "__main__":
+    main()
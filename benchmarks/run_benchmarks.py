@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+End-to-End Benchmark Suite
+
+Runs the three tools against the local fake OpenAI server and reports
+p50/p95/p99 latency, throughput and peak memory for each pipeline across
+concurrency levels and input sizes:
+
+- audio:   AudioTranscriber.process_audio_file   (varies transcript length)
+- search:  ProductSearchTool.search_products     (varies catalog size)
+- service: ServiceAnalyzer.analyze_service       (varies report length)
+
+Results are stored as JSON and can be compared against a previous run.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+import tracemalloc
+import importlib.util
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from fake_openai_server import FakeOpenAIServer, ServerConfig
+from datasets import write_catalog
+
+SEARCH_QUERIES = [
+    "Show me fitness equipment under $100",
+    "Find electronics with rating above 4.5 that are in stock",
+    "cheapest kitchen appliance",
+    "I want books under $30",
+    "most expensive clothing",
+]
+
+
+def load_tool_module(task_dir, filename, module_name):
+    """Import a tool script by path without requiring it to be on sys.path."""
+    directory = os.path.join(REPO_ROOT, task_dir)
+    if directory not in sys.path:
+        # Tool scripts import their sibling modules (e.g. tracing.py)
+        sys.path.insert(0, directory)
+    path = os.path.join(directory, filename)
+    spec = importlib.util.spec_from_file_location(module_name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered) + 0.5)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def time_calls(func, iterations, concurrency):
+    """Call `func(i)` `iterations` times on `concurrency` threads; return latencies and wall time."""
+    latencies = []
+    errors = 0
+
+    def timed(i):
+        start = time.perf_counter()
+        ok = func(i)
+        return (time.perf_counter() - start) * 1000, ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, ok in pool.map(timed, range(iterations)):
+            latencies.append(latency)
+            if not ok:
+                errors += 1
+    wall = time.perf_counter() - start
+    return latencies, wall, errors
+
+
+def peak_memory_mb(func, iterations):
+    """Peak traced Python memory over a few sequential calls (separate pass, tracing is slow)."""
+    func(0)  # warm up so one-off costs like the lazy SDK import are not counted
+    tracemalloc.start()
+    try:
+        for i in range(iterations):
+            func(i)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 3)
+
+
+def summarize(pipeline, size_label, size, concurrency, latencies, wall, errors, memory):
+    return {
+        "pipeline": pipeline,
+        "size_label": size_label,
+        "size": size,
+        "concurrency": concurrency,
+        "iterations": len(latencies),
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "throughput_rps": round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+        "peak_memory_mb": memory,
+        "errors": errors,
+    }
+
+
+def bench_audio(server, workdir, sizes, concurrency_levels, iterations, memory_iterations):
+    module = load_tool_module("task_11", "main.py", "bench_audio_main")
+    audio_path = os.path.join(workdir, "sample.mp3")
+    with open(audio_path, 'wb') as f:
+        f.write(b"\x00" * 32 * 1024)
+
+    transcriber = module.AudioTranscriber()
+    call = lambda i: transcriber.process_audio_file(audio_path) is not None
+
+    results = []
+    for words in sizes:
+        server.config.transcript_words = words
+        memory = peak_memory_mb(call, memory_iterations)
+        for concurrency in concurrency_levels:
+            latencies, wall, errors = time_calls(call, iterations, concurrency)
+            results.append(summarize("audio", "transcript_words", words, concurrency,
+                                     latencies, wall, errors, memory))
+    return results
+
+
+def bench_search(server, workdir, sizes, concurrency_levels, iterations, memory_iterations):
+    module = load_tool_module("task_10", "product_search.py", "bench_product_search")
+
+    results = []
+    for catalog_size in sizes:
+        catalog_path = write_catalog(os.path.join(workdir, f"catalog_{catalog_size}.json"), catalog_size)
+        tool = module.ProductSearchTool(catalog_path, cache_size=0)
+        call = lambda i: isinstance(tool.search_products(SEARCH_QUERIES[i % len(SEARCH_QUERIES)]), list)
+
+        memory = peak_memory_mb(lambda i: module.ProductSearchTool(catalog_path, cache_size=0) and call(i),
+                                memory_iterations)
+        for concurrency in concurrency_levels:
+            latencies, wall, errors = time_calls(call, iterations, concurrency)
+            results.append(summarize("search", "catalog_size", catalog_size, concurrency,
+                                     latencies, wall, errors, memory))
+    return results
+
+
+def bench_service(server, workdir, sizes, concurrency_levels, iterations, memory_iterations):
+    module = load_tool_module("task_9", "service_analyzer.py", "bench_service_analyzer")
+    analyzer = module.ServiceAnalyzer()
+    call = lambda i: analyzer.analyze_service("Spotify") is not None
+
+    results = []
+    for words in sizes:
+        server.config.report_words = words
+        memory = peak_memory_mb(call, memory_iterations)
+        for concurrency in concurrency_levels:
+            latencies, wall, errors = time_calls(call, iterations, concurrency)
+            results.append(summarize("service", "report_words", words, concurrency,
+                                     latencies, wall, errors, memory))
+    return results
+
+
+PIPELINES = {
+    "audio": (bench_audio, [500, 5000]),
+    "search": (bench_search, [50, 10000, 100000]),
+    "service": (bench_service, [800]),
+}
+
+
+def compare_results(current, baseline, threshold):
+    """Print per-configuration deltas against a baseline run; return number of regressions."""
+    key = lambda r: (r["pipeline"], r["size"], r["concurrency"])
+    previous = {key(r): r for r in baseline["results"]}
+    regressions = 0
+
+    print(f"\nComparison against baseline ({baseline['meta']['timestamp']}), threshold {threshold:.0%}:")
+    for result in current["results"]:
+        old = previous.get(key(result))
+        if not old:
+            continue
+        p95_delta = (result["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0.0
+        rps_delta = ((result["throughput_rps"] - old["throughput_rps"]) / old["throughput_rps"]
+                     if old["throughput_rps"] else 0.0)
+        regressed = p95_delta > threshold or rps_delta < -threshold
+        regressions += regressed
+        print(f"  {'REGRESSION' if regressed else 'ok':<10} {result['pipeline']:<8} "
+              f"size={result['size']:<7} c={result['concurrency']:<3} "
+              f"p95 {p95_delta:+.1%}  throughput {rps_delta:+.1%}")
+    return regressions
+
+
+def print_table(results):
+    print(f"\n{'Pipeline':<8} {'Size':>8} {'Conc':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'req/s':>8} {'Mem MB':>8} {'Err':>4}")
+    print("-" * 78)
+    for r in results:
+        print(f"{r['pipeline']:<8} {r['size']:>8} {r['concurrency']:>5} {r['p50_ms']:>9.2f} "
+              f"{r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['throughput_rps']:>8.2f} "
+              f"{r['peak_memory_mb']:>8.2f} {r['errors']:>4}")
+
+
+def main():
+    """Run the benchmark suite."""
+    parser = argparse.ArgumentParser(description="End-to-end benchmarks against a fake OpenAI server")
+    parser.add_argument('--pipelines', nargs='+', choices=sorted(PIPELINES), default=sorted(PIPELINES),
+                        help='Pipelines to run (default: all)')
+    parser.add_argument('--concurrency', nargs='+', type=int, default=[1, 4, 16],
+                        help='Concurrency levels (default: 1 4 16)')
+    parser.add_argument('--iterations', type=int, default=32, help='Calls per configuration')
+    parser.add_argument('--memory-iterations', type=int, default=3,
+                        help='Sequential calls in the traced memory pass')
+    parser.add_argument('--latency-ms', type=float, default=50.0, help='Fake server latency')
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help='Fake server latency jitter')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fake server 500 rate')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='Fake server 429 rate')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/<timestamp>.json)')
+    parser.add_argument('--baseline', help='Previous results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Relative change counted as a regression (default: 0.10)')
+
+    args = parser.parse_args()
+
+    config = ServerConfig(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, seed=0)
+    server = FakeOpenAIServer(config=config).start()
+    os.environ["OPENAI_BASE_URL"] = server.base_url
+    os.environ["OPENAI_API_KEY"] = "fake-benchmark-key"
+
+    results = []
+    original_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        # The tools write their output files to the current directory
+        os.chdir(workdir)
+        try:
+            for name in args.pipelines:
+                bench, sizes = PIPELINES[name]
+                print(f"Running {name} benchmark...")
+                with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                    results.extend(bench(server, workdir, sizes, args.concurrency,
+                                         args.iterations, args.memory_iterations))
+        finally:
+            os.chdir(original_cwd)
+            server.stop()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "latency_ms": args.latency_ms,
+            "error_rate": args.error_rate,
+            "rate_limit_rate": args.rate_limit_rate,
+            "iterations": args.iterations,
+            "server_requests": server.counters,
+        },
+        "results": results,
+    }
+    print_table(results)
+
+    output = args.output
+    if not output:
+        os.makedirs(os.path.join(BENCH_DIR, "results"), exist_ok=True)
+        output = os.path.join(BENCH_DIR, "results",
+                              f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults saved to: {output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare_results(report, json.load(f), args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Sharded Catalog Benchmark
+
+Measures query throughput of the sharded (multi-process) filter backend
+for increasing worker counts, against the single-process NumPy backend as
+a baseline. Queries are issued from several client threads at once (two
+per worker); the NumPy backend is measured with the same number of client
+threads, since its mask operations release the GIL and scale with threads
+too. Every result is checked against the NumPy backend.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+TASK_DIR = os.path.join(os.path.dirname(BENCH_DIR), "task_10")
+sys.path.insert(0, BENCH_DIR)
+sys.path.insert(0, TASK_DIR)
+
+from datasets import generate_catalog
+from filter_backends import CRITERIA
+
+
+def measure(engine, queries, clients):
+    """Run `queries` criteria dicts on `clients` threads; return (queries/s, p50 ms)."""
+    latencies = []
+
+    def run(criteria):
+        start = time.perf_counter()
+        engine.filter_rows(criteria)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(run, queries))
+    wall = time.perf_counter() - start
+    latencies.sort()
+    return len(queries) / wall, latencies[len(latencies) // 2]
+
+
+def main():
+    """Run the scaling benchmark."""
+    cpu_count = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, cpu_count} & set(range(1, cpu_count + 1)))
+
+    parser = argparse.ArgumentParser(description="Throughput of the sharded catalog backend by worker count")
+    parser.add_argument('--size', type=int, default=2_000_000, help='Catalog size (default: 2000000)')
+    parser.add_argument('--workers', nargs='+', type=int, default=default_workers,
+                        help=f'Worker counts to test (default: {" ".join(map(str, default_workers))})')
+    parser.add_argument('--queries', type=int, default=70, help='Queries per configuration')
+    parser.add_argument('--json', dest='json_output', help='Write the results to this JSON file')
+
+    args = parser.parse_args()
+
+    from numpy_filter import NumpyFilterEngine
+    from sharded_catalog import ShardedCatalog
+
+    print(f"Generating catalog with {args.size:,} products...")
+    catalog = generate_catalog(args.size)
+    queries = [CRITERIA[i % len(CRITERIA)] for i in range(args.queries)]
+
+    baseline = NumpyFilterEngine(catalog)
+    expected = {json.dumps(c, sort_keys=True): baseline.filter_rows(c).tolist() for c in CRITERIA}
+    results = []
+    numpy_runs = {}  # clients -> (queries/s, p50 ms)
+
+    print(f"\n{'Workers':>8} {'Clients':>8} {'NumPy q/s':>10} {'Sharded q/s':>12} "
+          f"{'NumPy p50':>10} {'Sharded p50':>12} {'Speedup':>8}")
+    print("-" * 74)
+
+    for workers in args.workers:
+        clients = workers * 2
+        if clients not in numpy_runs:
+            numpy_runs[clients] = measure(baseline, queries, clients=clients)
+            qps, p50 = numpy_runs[clients]
+            results.append({"backend": "numpy", "workers": 1, "clients": clients,
+                            "queries_per_s": round(qps, 2), "p50_ms": round(p50, 2)})
+        qps, p50 = numpy_runs[clients]
+
+        start = time.perf_counter()
+        with ShardedCatalog(catalog, workers=workers) as sharded:
+            setup_ms = (time.perf_counter() - start) * 1000
+            for criteria in CRITERIA:  # warm up workers and verify results
+                if sharded.filter_rows(criteria).tolist() != expected[json.dumps(criteria, sort_keys=True)]:
+                    print(f"MISMATCH with {workers} workers for {criteria}")
+                    sys.exit(1)
+            sharded_qps, sharded_p50 = measure(sharded, queries, clients=clients)
+
+        speedup = sharded_qps / qps if qps else 0.0
+        print(f"{workers:>8} {clients:>8} {qps:>10.2f} {sharded_qps:>12.2f} "
+              f"{p50:>10.2f} {sharded_p50:>12.2f} {speedup:>7.2f}x")
+        results.append({"backend": "sharded", "workers": workers, "clients": clients,
+                        "queries_per_s": round(sharded_qps, 2), "p50_ms": round(sharded_p50, 2),
+                        "setup_ms": round(setup_ms, 2)})
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump({"size": args.size, "cpu_count": cpu_count, "results": results}, f, indent=2)
+        print(f"\nResults saved to: {args.json_output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+
+Measures cold-start time of the three Python console tools using
+`python -X importtime`. Each scenario is run several times in a fresh
+interpreter; the report shows median wall time, total import time and
+whether the OpenAI SDK was imported at all.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (entry point, working directory, scenario label, CLI arguments)
+SCENARIOS = [
+    ("service_analyzer", "task_9", "help", ["service_analyzer.py", "--help"]),
+    ("product_search", "task_10", "bad path", ["product_search.py", "missing_products.json"]),
+    ("main", "task_11", "help", ["main.py", "--help"]),
+    ("main", "task_11", "bad path", ["main.py", "missing_audio.mp3"]),
+]
+
+
+def parse_importtime(stderr):
+    """Parse `-X importtime` output into {module: cumulative_us} for top-level imports."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative = int(parts[1].strip())
+        except ValueError:
+            continue  # header line
+        name = parts[2].rstrip()
+        # Nested imports are indented; only top-level entries add up to the total
+        if not name.startswith("  "):
+            modules[name.strip()] = cumulative
+    return modules
+
+
+def run_scenario(workdir, argv, runs):
+    """Run one scenario `runs` times and return timing statistics."""
+    wall_times = []
+    import_totals = []
+    imported_openai = False
+    slowest = []
+
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime"] + argv,
+            cwd=os.path.join(REPO_ROOT, workdir),
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+        )
+        wall_times.append((time.perf_counter() - start) * 1000)
+
+        modules = parse_importtime(proc.stderr)
+        import_totals.append(sum(modules.values()) / 1000)
+        imported_openai = imported_openai or "openai" in modules
+        slowest = sorted(modules.items(), key=lambda m: m[1], reverse=True)[:5]
+
+    return {
+        "wall_ms_median": round(statistics.median(wall_times), 2),
+        "wall_ms_min": round(min(wall_times), 2),
+        "import_ms_median": round(statistics.median(import_totals), 2),
+        "imports_openai": imported_openai,
+        "slowest_imports": [{"module": m, "ms": round(us / 1000, 2)} for m, us in slowest],
+    }
+
+
+def main():
+    """Run all startup scenarios and print a report."""
+    parser = argparse.ArgumentParser(
+        description="Measure cold-start time of the console tools with -X importtime")
+    parser.add_argument(
+        '--runs', '-n', type=int, default=5,
+        help='Number of runs per scenario (default: 5)')
+    parser.add_argument(
+        '--json', dest='json_output',
+        help='Write the results to this JSON file')
+
+    args = parser.parse_args()
+
+    results = []
+    print(f"{'Entry point':<18} {'Scenario':<10} {'Wall (ms)':>10} {'Imports (ms)':>13}  openai")
+    print("-" * 62)
+    for entry, workdir, label, argv in SCENARIOS:
+        stats = run_scenario(workdir, argv, args.runs)
+        results.append({"entry_point": entry, "scenario": label, **stats})
+        print(f"{entry:<18} {label:<10} {stats['wall_ms_median']:>10.2f} "
+              f"{stats['import_ms_median']:>13.2f}  {'yes' if stats['imports_openai'] else 'no'}")
+
+    if args.json_output:
+        with open(args.json_output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {args.json_output}")
+
+
+if __name__ == "__main__":
+    main()
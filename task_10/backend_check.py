@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Backend Consistency Check
+
+Fast randomized check that the NumPy and sharded filter backends return
+exactly the same products, in the same order, as the pure-Python path.
+Catalogs are small and deliberately full of ties: prices and ratings come
+from a few values and names repeat, so ordering and extreme-value ties
+are exercised on every run. Runs in seconds:
+
+    python backend_check.py
+    python backend_check.py --rounds 2000 --seed 7
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import tempfile
+
+CATEGORIES = ["Electronics", "Fitness", "Kitchen", "Books", "Clothing"]
+NAMES = ["Wireless Mouse", "wireless mouse", "Pro Blender", "Yoga Mat", "Smart Watch Pro", "Mini Speaker",
+         "Cookbook", "Running Shoes", "USB-C Cable", "Desk Lamp"]
+PRICES = [0.99, 9.99, 19.99, 49.0, 49.99, 100.0, 250.0, 999.99]
+RATINGS = [1.0, 3.5, 4.0, 4.5, 4.8, 5.0]
+SORTS = ["price_asc", "price_desc", "rating_asc", "rating_desc", "name_asc", "name_desc"]
+EXTREMES = ["lowest_rating", "highest_rating", "cheapest", "most_expensive"]
+KEYWORDS = ["wireless", "PRO", "mat", "mini", "usb-c", "zzz"]
+
+
+def generate_catalog(size, rng):
+    """`size` products with many tied prices, ratings and names."""
+    return [{
+        "name": rng.choice(NAMES),
+        "category": rng.choice(CATEGORIES),
+        "price": rng.choice(PRICES),
+        "rating": rng.choice(RATINGS),
+        "in_stock": rng.random() < 0.7,
+    } for _ in range(size)]
+
+
+def random_criteria(rng):
+    """Criteria as extract_criteria could return them, bounds landing on tied values."""
+    criteria = {}
+    if rng.random() < 0.5:
+        criteria["category"] = rng.choice(CATEGORIES + ["Garden"])
+    if rng.random() < 0.3:
+        criteria["max_price"] = rng.choice(PRICES)
+    if rng.random() < 0.3:
+        criteria["min_price"] = rng.choice(PRICES)
+    if rng.random() < 0.3:
+        criteria["min_rating"] = rng.choice(RATINGS)
+    if rng.random() < 0.2:
+        criteria["max_rating"] = rng.choice(RATINGS)
+    if rng.random() < 0.4:
+        criteria["in_stock_only"] = True
+    if rng.random() < 0.3:
+        criteria["keywords"] = rng.sample(KEYWORDS, rng.randint(1, 2))
+    if rng.random() < 0.5:
+        criteria["sort_by"] = rng.choice(SORTS)
+    if rng.random() < 0.4:
+        criteria["limit"] = rng.choice([0, 1, 3, 10, 50])
+    if rng.random() < 0.25:
+        criteria["find_extreme"] = rng.choice(EXTREMES)
+    return criteria
+
+
+def make_tool(catalog, backend, workers=None):
+    """ProductSearchTool (result cache off) on the given catalog."""
+    from product_search import ProductSearchTool
+
+    os.environ.setdefault("OPENAI_API_KEY", "backend-check")
+    with tempfile.NamedTemporaryFile('w', suffix=".json", delete=False) as f:
+        json.dump(catalog, f)
+    try:
+        return ProductSearchTool(f.name, backend=backend, workers=workers, cache_size=0)
+    finally:
+        os.remove(f.name)
+
+
+def same_products(expected, actual):
+    """Same product objects in the same order."""
+    return len(expected) == len(actual) and all(a is b for a, b in zip(expected, actual))
+
+
+def main():
+    """Run the check; exits with status 1 on the first mismatch."""
+    parser = argparse.ArgumentParser(description="Check that all filter backends match the pure-Python path")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[0, 1, 25, 2000],
+                        help='Catalog sizes (default: 0 1 25 2000)')
+    parser.add_argument('--rounds', type=int, default=300, help='Random criteria per catalog (default: 300)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed (default: 0)')
+    parser.add_argument('--workers', type=int, default=2, help='Worker processes for the sharded backend')
+
+    args = parser.parse_args()
+
+    from numpy_filter import numpy_available
+    if not numpy_available():
+        print("numpy is not installed; only the pure-Python backend is available, nothing to compare.")
+        return
+
+    rng = random.Random(args.seed)
+    checks = 0
+    for size in args.sizes:
+        catalog = generate_catalog(size, rng)
+        python_tool = make_tool(catalog, "python")
+        others = [make_tool(catalog, "numpy"), make_tool(catalog, "sharded", workers=args.workers)]
+        try:
+            # The tools load their own copy of the catalog; compare against the Python tool's dicts
+            for tool in others:
+                tool.products = python_tool.products
+            for _ in range(args.rounds):
+                criteria = random_criteria(rng)
+                expected = python_tool.filter_products(criteria)
+                for tool in others:
+                    actual = tool.filter_products(criteria)
+                    if not same_products(expected, actual):
+                        print(f"MISMATCH ({tool.backend}, {size} products) for {json.dumps(criteria)}: "
+                              f"python={len(expected)} {tool.backend}={len(actual)} rows")
+                        sys.exit(1)
+                    checks += 1
+        finally:
+            for tool in others:
+                tool.close()
+
+    print(f"OK: {checks} comparisons across {len(args.sizes)} catalogs, backends numpy and sharded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""
+Criteria Fields
+
+How `sort_by` and `find_extreme` values map to product fields, shared by
+every filter backend (pure Python, NumPy and sharded) so that they cannot
+disagree. Kept free of optional dependencies.
+"""
+
+# sort_by value -> (product field, descending)
+SORT_FIELDS = {
+    "price_asc": ("price", False),
+    "price_desc": ("price", True),
+    "rating_asc": ("rating", False),
+    "rating_desc": ("rating", True),
+    "name_asc": ("name", False),
+    "name_desc": ("name", True),
+}
+
+# find_extreme value -> (product field, picker)
+EXTREME_FIELDS = {
+    "lowest_rating": ("rating", min),
+    "highest_rating": ("rating", max),
+    "cheapest": ("price", min),
+    "most_expensive": ("price", max),
+}
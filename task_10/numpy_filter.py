@@ -0,0 +1,203 @@
+"""
+NumPy Filter Engine
+
+Optional vectorized backend for ProductSearchTool.filter_products. The
+catalog is held as contiguous column arrays (price, rating, in_stock and a
+category code); all structured criteria are combined into one boolean mask
+and sorting uses a stable argsort (top-K: np.partition, then a sort of the K rows).
+
+Results are identical to the pure-Python path, including the order of ties
+(Python's sort is stable, so ties keep catalog order here as well).
+"""
+
+from typing import List, Dict, Any
+
+from criteria_fields import SORT_FIELDS, EXTREME_FIELDS
+from tracing import Tracer
+
+try:
+    import numpy as np
+except ImportError:  # numpy is an optional dependency
+    np = None
+
+def numpy_available() -> bool:
+    """Return True if the NumPy backend can be used."""
+    return np is not None
+
+
+class NumpyFilterEngine:
+    def __init__(self, products: List[Dict[str, Any]], tracer=None):
+        """Build column arrays for `products` (the list is referenced, not copied)."""
+        if np is None:
+            raise ImportError("The numpy backend requires numpy. Install it with: pip install numpy")
+
+        self.products = products
+        self.tracer = tracer or Tracer()
+
+        count = len(products)
+        self.price = np.fromiter((p["price"] for p in products), dtype=np.float64, count=count)
+        self.rating = np.fromiter((p["rating"] for p in products), dtype=np.float64, count=count)
+        self.in_stock = np.fromiter((bool(p["in_stock"]) for p in products), dtype=bool, count=count)
+
+        self.category_codes = {}
+        self.category = np.fromiter(
+            (self.category_codes.setdefault(p["category"], len(self.category_codes)) for p in products),
+            dtype=np.int32, count=count)
+
+        self.size = count
+
+        # Lower-cased names for keyword matching and a lexicographic rank for name sorts;
+        # both are built on first use since most queries need neither
+        self._names_lower = None
+        self._name_rank = None
+        self._names_loader = lambda: [p["name"].lower() for p in self.products]
+
+    @classmethod
+    def from_columns(cls, price, rating, in_stock, category, category_codes,
+                     name_rank, names_loader, tracer=None):
+        """
+        Build an engine over existing column arrays (e.g. views into shared memory)
+        without a product list. `names_loader` returns the lower-cased names when a
+        keyword query first needs them. Only the `*_rows` methods can be used.
+        """
+        if np is None:
+            raise ImportError("The numpy backend requires numpy. Install it with: pip install numpy")
+
+        engine = cls.__new__(cls)
+        engine.products = None
+        engine.tracer = tracer or Tracer()
+        engine.price = price
+        engine.rating = rating
+        engine.in_stock = in_stock
+        engine.category = category
+        engine.category_codes = category_codes
+        engine.size = len(price)
+        engine._names_lower = None
+        engine._name_rank = name_rank
+        engine._names_loader = names_loader
+        return engine
+
+    @property
+    def names_lower(self) -> List[str]:
+        if self._names_lower is None:
+            self._names_lower = self._names_loader()
+        return self._names_lower
+
+    @property
+    def name_rank(self):
+        if self._name_rank is None:
+            names = np.array([p["name"] for p in self.products], dtype=str)
+            # Equal names share a rank, so stable sorts keep them in catalog order
+            _, self._name_rank = np.unique(names, return_inverse=True)
+        return self._name_rank
+
+    def _category_mask(self, category):
+        code = self.category_codes.get(category)
+        if code is None:
+            return np.zeros(self.size, dtype=bool)
+        return self.category == code
+
+    def _apply_keywords(self, indices, keywords):
+        """Keep indices whose lower-cased name contains every keyword."""
+        names = self.names_lower
+        for keyword in keywords:
+            keyword = keyword.lower()
+            indices = [i for i in indices if keyword in names[i]]
+        return np.asarray(indices, dtype=np.int64)
+
+    def _sort_keys(self, indices, sort_by):
+        field, descending = SORT_FIELDS[sort_by]
+        if field == "name":
+            keys = self.name_rank[indices].astype(np.float64)
+        else:
+            keys = getattr(self, field)[indices]
+        return -keys if descending else keys
+
+    def _top_k(self, keys, limit):
+        """Positions of the `limit` smallest keys, ordered by (key, position)."""
+        if limit >= len(keys):
+            return np.argsort(keys, kind="stable")
+        kth = np.partition(keys, limit - 1)[limit - 1]
+        below = np.flatnonzero(keys < kth)
+        ties = np.flatnonzero(keys == kth)[:limit - len(below)]
+        chosen = np.sort(np.concatenate([below, ties]))
+        return chosen[np.argsort(keys[chosen], kind="stable")]
+
+    def filter(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Vectorized equivalent of ProductSearchTool.filter_products."""
+        products = self.products
+        return [products[i] for i in self.filter_rows(criteria).tolist()]
+
+    def filter_rows(self, criteria: Dict[str, Any]):
+        """Like `filter`, but return the matching row ids as an int64 array."""
+        if criteria.get("find_extreme"):
+            return self.find_extreme_rows(criteria["find_extreme"], criteria)
+
+        with self.tracer.span("filter.mask") as span:
+            mask = np.ones(self.size, dtype=bool)
+            if criteria.get("category"):
+                mask &= self._category_mask(criteria["category"])
+            if criteria.get("max_price") is not None:
+                mask &= self.price <= criteria["max_price"]
+            if criteria.get("min_price") is not None:
+                mask &= self.price >= criteria["min_price"]
+            if criteria.get("min_rating") is not None:
+                mask &= self.rating >= criteria["min_rating"]
+            if criteria.get("max_rating") is not None:
+                mask &= self.rating <= criteria["max_rating"]
+            if criteria.get("in_stock_only"):
+                mask &= self.in_stock
+            indices = np.flatnonzero(mask)
+            span.set(rows_out=len(indices))
+
+        if criteria.get("keywords"):
+            with self.tracer.span("filter.keywords") as span:
+                indices = self._apply_keywords(indices.tolist(), criteria["keywords"])
+                span.set(rows_out=len(indices))
+
+        limit = criteria.get("limit")
+        limit = limit if limit is not None and limit > 0 else None
+
+        sort_by = criteria.get("sort_by")
+        if sort_by in SORT_FIELDS:
+            with self.tracer.span("filter.sort", sort_by=sort_by):
+                keys = self._sort_keys(indices, sort_by)
+                if limit is not None:
+                    indices = indices[self._top_k(keys, limit)]
+                else:
+                    indices = indices[np.argsort(keys, kind="stable")]
+        elif limit is not None:
+            indices = indices[:limit]
+
+        return indices
+
+    def find_extreme(self, extreme_type: str, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Vectorized equivalent of ProductSearchTool.find_extreme_products."""
+        products = self.products
+        return [products[i] for i in self.find_extreme_rows(extreme_type, criteria).tolist()]
+
+    def find_extreme_rows(self, extreme_type: str, criteria: Dict[str, Any]):
+        """Like `find_extreme`, but return the matching row ids."""
+        if not self.size:
+            return np.empty(0, dtype=np.int64)
+
+        mask = np.ones(self.size, dtype=bool)
+        if criteria.get("category"):
+            mask &= self._category_mask(criteria["category"])
+        if criteria.get("in_stock_only"):
+            mask &= self.in_stock
+        indices = np.flatnonzero(mask)
+        if criteria.get("keywords"):
+            indices = self._apply_keywords(indices.tolist(), criteria["keywords"])
+
+        if len(indices) == 0:
+            return indices
+
+        if extreme_type not in EXTREME_FIELDS:
+            return indices
+
+        field, pick = EXTREME_FIELDS[extreme_type]
+        values = getattr(self, field)[indices]
+        target = values.min() if pick is min else values.max()
+        return indices[values == target]
+
@@ -5,36 +5,117 @@ A console-based application that uses natural language processing to search for
 based on user preferences using OpenAI function calling.
 """
 
+import argparse
+import base64
 import json
 import os
 import sys
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
-from dotenv import load_dotenv
+from array import array
+from itertools import islice
+from operator import itemgetter
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence
 
-# Load environment variables
-load_dotenv()
+from criteria_fields import SORT_FIELDS, EXTREME_FIELDS
+from result_cache import ResultCache
+from tracing import Tracer
 
 class ProductSearchTool:
-    def __init__(self, products_file: str = "products.json"):
-        """Initialize the product search tool with products data."""
+    def __init__(self, products_file: str = "products.json", tracer: Optional[Tracer] = None,
+                 backend: str = "python", text_ranking: bool = False, workers: Optional[int] = None,
+                 cache_size: int = 256):
+        """
+        Initialize the product search tool with products data.
+        
+        `backend` selects the filter engine: "python" (default), "numpy", which
+        evaluates criteria on column arrays and suits very large catalogs, or
+        "sharded", which spreads the catalog over `workers` processes.
+        With `text_ranking`, results are ranked by BM25 relevance to the query
+        instead of requiring exact keyword matches in product names.
+        Up to `cache_size` filter results are cached as row ids (0 disables the cache).
+        """
+        if backend not in ("python", "numpy", "sharded"):
+            raise ValueError(f"Unknown filter backend: {backend}")
+        
         self.products_file = products_file
+        self.text_ranking = text_ranking
+        self.backend = backend
+        self.workers = workers
+        self.tracer = tracer or Tracer()
+        self.engine = None
+        self.catalog_version = 0
+        self.cache = ResultCache(max_entries=cache_size) if cache_size > 0 else None
         self.products = self.load_products()
         
-        # Initialize OpenAI client
+        # Load environment variables here rather than at import time so that
+        # usage errors exit without importing dotenv/openai
+        from dotenv import load_dotenv
+        load_dotenv()
+        
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             print("Error: Please set your OPENAI_API_KEY environment variable.")
             print("You can create a .env file with: OPENAI_API_KEY=your_api_key_here")
             sys.exit(1)
         
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self._client = None
+    
+    @property
+    def client(self):
+        """OpenAI client, created lazily on the first API call."""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
+    
+    def close(self):
+        """Release backend resources (worker processes, shared memory)."""
+        if hasattr(self.engine, "close"):
+            self.engine.close()
+    
+    @property
+    def products(self) -> List[Dict[str, Any]]:
+        """The product catalog; assigning a new list counts as a catalog change."""
+        return self._products
+    
+    @products.setter
+    def products(self, products: List[Dict[str, Any]]):
+        self._products = products
+        self.catalog_changed()
+    
+    def catalog_changed(self):
+        """
+        Start a new catalog version: drop cached results and derived indexes and
+        rebuild the filter engine. Call this after modifying `products` in place.
+        """
+        self.catalog_version += 1
+        self._text_index = None
+        self._planner = None
+        if self.cache is not None:
+            self.cache.invalidate()
+        
+        self.close()
+        self.engine = None
+        if self.backend == "numpy":
+            # Imported here so the default backend never pays for importing numpy
+            from numpy_filter import NumpyFilterEngine
+            self.engine = NumpyFilterEngine(self.products, tracer=self.tracer)
+        elif self.backend == "sharded":
+            from sharded_catalog import ShardedCatalog
+            self.engine = ShardedCatalog(self.products, workers=self.workers, tracer=self.tracer)
+    
+    def reload_products(self):
+        """Re-read the products file (a new catalog version)."""
+        self.products = self.load_products()
     
     def load_products(self) -> List[Dict[str, Any]]:
         """Load products from JSON file."""
         try:
-            with open(self.products_file, 'r') as f:
-                return json.load(f)
+            with self.tracer.span("catalog.load", file=self.products_file) as span, \
+                    open(self.products_file, 'r') as f:
+                products = json.load(f)
+                span.set(rows=len(products))
+                return products
         except FileNotFoundError:
             print(f"Error: Products file '{self.products_file}' not found.")
             sys.exit(1)
@@ -46,6 +127,18 @@ class ProductSearchTool:
         """
         Use OpenAI function calling to extract search criteria and filter products.
         """
+        try:
+            criteria = self.extract_criteria(user_query)
+            return self.apply_criteria(user_query, criteria)
+        except Exception as e:
+            print(f"Error calling OpenAI API: {e}")
+            return []
+    
+    def extract_criteria(self, user_query: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract search criteria from the query with OpenAI function calling.
+        Returns None if the model did not call the function.
+        """
         # Define the function schema for OpenAI
         function_schema = {
             "name": "search_products",
@@ -102,8 +195,8 @@ class ProductSearchTool:
             }
         }
         
-        try:
-            # Make the API call with function calling
+        # Make the API call with function calling
+        with self.tracer.span("openai.function_call", model="gpt-4.1-mini") as span:
             response = self.client.chat.completions.create(
                 model="gpt-4.1-mini",
                 messages=[
@@ -134,72 +227,191 @@ Examples:
                 functions=[function_schema],
                 function_call="auto"
             )
-            
-            # Check if a function was called
-            if response.choices[0].message.function_call:
-                function_args = json.loads(response.choices[0].message.function_call.arguments)
-                return self.filter_products(function_args)
-            else:
-                # Fallback: return all products if no function call
-                return self.products
-                
-        except Exception as e:
-            print(f"Error calling OpenAI API: {e}")
-            return []
-    
-    def filter_products(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Filter products based on extracted criteria."""
-        filtered_products = self.products.copy()
-        
-        # Handle extreme value searches first
-        if "find_extreme" in criteria and criteria["find_extreme"]:
-            return self.find_extreme_products(criteria["find_extreme"], filtered_products, criteria)
+            span.record_usage(response)
         
-        # Filter by category
-        if "category" in criteria and criteria["category"]:
-            filtered_products = [p for p in filtered_products if p["category"] == criteria["category"]]
+        # Check if a function was called
+        if response.choices[0].message.function_call:
+            return json.loads(response.choices[0].message.function_call.arguments)
+        return None
+    
+    def apply_criteria(self, user_query: str, criteria: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Return the products matching extracted criteria (None means no criteria were extracted)."""
+        if criteria is not None:
+            if self.text_ranking:
+                return self.ranked_search(user_query, criteria)
+            return self.filter_products(criteria)
+        elif self.text_ranking:
+            # Fallback: rank the whole catalog against the query
+            return self.rank_products(user_query) or self.products
+        else:
+            # Fallback: return all products if no function call
+            return self.products
+    
+    @property
+    def text_index(self):
+        """BM25 index over product names and categories, built on first use."""
+        if self._text_index is None:
+            from text_index import TextIndex
+            with self.tracer.span("index.build", rows=len(self.products)):
+                self._text_index = TextIndex(self.products)
+        return self._text_index
+    
+    def rank_products(self, query: str, candidates: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Order candidates (catalog products; default: the whole catalog) by text relevance
+        to the query, dropping those that match no term.
+        """
+        rows_in = len(self.products if candidates is None else candidates)
+        with self.tracer.span("filter.rank", rows_in=rows_in) as span:
+            ranked = self.text_index.rank(query, candidates)
+            span.set(rows_out=len(ranked))
+            return ranked
+    
+    def ranked_search(self, user_query: str, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Apply the structured criteria, then rank the survivors by relevance to the
+        query and extracted keywords instead of exact keyword matching.
+        """
+        if criteria.get("find_extreme"):
+            return self.filter_products(criteria)
         
-        # Filter by price range
-        if "max_price" in criteria and criteria["max_price"] is not None:
-            filtered_products = [p for p in filtered_products if p["price"] <= criteria["max_price"]]
+        structured = {k: v for k, v in criteria.items() if k not in ("keywords", "sort_by", "limit")}
+        query = " ".join([user_query] + list(criteria.get("keywords") or []))
         
-        if "min_price" in criteria and criteria["min_price"] is not None:
-            filtered_products = [p for p in filtered_products if p["price"] >= criteria["min_price"]]
+        if not self.text_index.query_terms(query):
+            candidates = self.filter_products(structured)
+        else:
+            # Stay on row ids end to end; mapping dicts back to rows dominates on large catalogs
+            with self.tracer.span("filter.total", rows_in=len(self.products)) as span:
+                rows = self.filter_rows(structured)
+                span.set(rows_out=len(rows))
+            with self.tracer.span("filter.rank", rows_in=len(rows)) as span:
+                candidates = [self.products[row] for row in self.text_index.rank_rows(query, rows)]
+                span.set(rows_out=len(candidates))
         
-        # Filter by rating range
-        if "min_rating" in criteria and criteria["min_rating"] is not None:
-            filtered_products = [p for p in filtered_products if p["rating"] >= criteria["min_rating"]]
+        if criteria.get("sort_by"):
+            candidates = self.sort_products(candidates, criteria["sort_by"])
+        if criteria.get("limit") is not None and criteria["limit"] > 0:
+            candidates = candidates[:criteria["limit"]]
+        return candidates
+    
+    def filter_products(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Filter products based on extracted criteria."""
+        with self.tracer.span("filter.total", rows_in=len(self.products)) as span:
+            if self.cache is None:
+                filtered_products = self._filter_products(criteria)
+            else:
+                filtered_products = list(map(self.products.__getitem__, self.filter_rows(criteria)))
+            span.set(rows_out=len(filtered_products))
+            return filtered_products
+    
+    def filter_rows(self, criteria: Dict[str, Any]):
+        """
+        Row ids (catalog positions) of the products `filter_products` returns, in the
+        same order. Results are served from and stored in the result cache, if enabled.
+        """
+        cache = self.cache
+        if cache is not None:
+            with self.tracer.span("filter.cache") as span:
+                rows = cache.get(criteria, self.catalog_version)
+                span.set(hit=rows is not None)
+            if rows is not None:
+                return rows
         
-        if "max_rating" in criteria and criteria["max_rating"] is not None:
-            filtered_products = [p for p in filtered_products if p["rating"] <= criteria["max_rating"]]
+        if self.engine is not None:
+            rows = self.engine.filter_rows(criteria)
+        else:
+            rows = self._python_filter_rows(criteria)
         
-        # Filter by stock status
-        if "in_stock_only" in criteria and criteria["in_stock_only"]:
-            filtered_products = [p for p in filtered_products if p["in_stock"]]
+        if cache is not None:
+            cache.put(criteria, self.catalog_version, rows)
+        return rows
+    
+    def _filter_products(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if self.engine is not None:
+            return self.engine.filter(criteria)
+        return list(map(self.products.__getitem__, self._python_filter_rows(criteria)))
+    
+    def _python_filter_rows(self, criteria: Dict[str, Any], plan=None) -> List[int]:
+        """
+        Row ids of the products `filter_products` returns, on the pure-Python backend.
+        The extreme value, sort and limit steps are recorded in `plan` (planned here if None).
+        """
+        plan = plan or self.plan_query(criteria)
+        rows = plan.execute_rows(self.products, self.tracer)
+        products = self.products
         
-        # Filter by keywords
-        if "keywords" in criteria and criteria["keywords"]:
-            for keyword in criteria["keywords"]:
-                filtered_products = [
-                    p for p in filtered_products 
-                    if keyword.lower() in p["name"].lower()
-                ]
+        # Handle extreme value searches (the plan applied the filters that precede them)
+        if "find_extreme" in criteria and criteria["find_extreme"]:
+            extreme_type = criteria["find_extreme"]
+            if rows and extreme_type in EXTREME_FIELDS:
+                with self.tracer.span("filter.extreme", extreme_type=extreme_type) as span:
+                    field, pick = EXTREME_FIELDS[extreme_type]
+                    target = pick(products[row][field] for row in rows)
+                    rows = [row for row in rows if products[row][field] == target]
+                    span.set(rows_out=len(rows))
+            plan.add_step(f"extreme: {extreme_type}", len(rows))
+            return rows
         
         # Apply sorting
         if "sort_by" in criteria and criteria["sort_by"]:
-            filtered_products = self.sort_products(filtered_products, criteria["sort_by"])
+            with self.tracer.span("filter.sort", sort_by=criteria["sort_by"]):
+                rows = self._sort_rows(rows, criteria["sort_by"])
+            plan.add_step(f"sort: {criteria['sort_by']}", len(rows))
         
         # Apply limit
         if "limit" in criteria and criteria["limit"] is not None and criteria["limit"] > 0:
-            filtered_products = filtered_products[:criteria["limit"]]
+            rows = rows[:criteria["limit"]]
+            plan.add_step(f"limit: {criteria['limit']}", len(rows))
         
-        return filtered_products
+        return rows
+    
+    def _sort_rows(self, rows: Sequence[int], sort_by: str) -> Sequence[int]:
+        """Row ids ordered like `sort_products` orders their products (a stable sort of positions)."""
+        if sort_by not in SORT_FIELDS:
+            return rows
+        field, descending = SORT_FIELDS[sort_by]
+        products = self.products
+        keys = [products[row][field] for row in rows]
+        return list(map(rows.__getitem__, sorted(range(len(rows)), key=keys.__getitem__, reverse=descending)))
+    
+    def plan_query(self, criteria: Dict[str, Any]):
+        """Plan the filter stage of `criteria` from catalog statistics (pure-Python backend)."""
+        if self._planner is None:
+            from query_planner import CatalogStatistics, QueryPlanner
+            self._planner = QueryPlanner(CatalogStatistics(self.products))
+        with self.tracer.span("filter.plan"):
+            return self._planner.plan(criteria)
+    
+    def explain(self, criteria: Optional[Dict[str, Any]]) -> str:
+        """
+        Run the filter stage of `criteria` on the pure-Python backend, bypassing the
+        result cache, and return the plan with estimated and actual rows per step.
+        """
+        if criteria is None:
+            return "No criteria extracted; all products are returned."
+        
+        plan = self.plan_query(criteria)
+        self._python_filter_rows(criteria, plan)
+        
+        lines = [f"Criteria: {json.dumps(criteria, sort_keys=True)}"]
+        if self.engine is not None:
+            lines.append(f"Note: the {self.backend} backend evaluates all predicates as one vectorized "
+                         "mask; the pure-Python plan is shown.")
+        lines.append(plan.explain())
+        return "\n".join(lines)
     
     def find_extreme_products(self, extreme_type: str, products: List[Dict[str, Any]], criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Find products with extreme values (lowest/highest rating, cheapest/most expensive)."""
         if not products:
             return []
         
+        with self.tracer.span("filter.extreme", extreme_type=extreme_type) as span:
+            extreme_products = self._find_extreme_products(extreme_type, products, criteria)
+            span.set(rows_out=len(extreme_products))
+            return extreme_products
+    
+    def _find_extreme_products(self, extreme_type: str, products: List[Dict[str, Any]], criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
         # Apply other filters first (category, stock, keywords)
         filtered_products = products.copy()
         
@@ -216,58 +428,208 @@ Examples:
                     if keyword.lower() in p["name"].lower()
                 ]
         
-        if not filtered_products:
-            return []
+        if not filtered_products or extreme_type not in EXTREME_FIELDS:
+            return filtered_products
         
-        if extreme_type == "lowest_rating":
-            min_rating = min(p["rating"] for p in filtered_products)
-            return [p for p in filtered_products if p["rating"] == min_rating]
-        
-        elif extreme_type == "highest_rating":
-            max_rating = max(p["rating"] for p in filtered_products)
-            return [p for p in filtered_products if p["rating"] == max_rating]
-            
-        elif extreme_type == "cheapest":
-            min_price = min(p["price"] for p in filtered_products)
-            return [p for p in filtered_products if p["price"] == min_price]
-            
-        elif extreme_type == "most_expensive":
-            max_price = max(p["price"] for p in filtered_products)
-            return [p for p in filtered_products if p["price"] == max_price]
-        
-        return filtered_products
+        field, pick = EXTREME_FIELDS[extreme_type]
+        target = pick(map(itemgetter(field), filtered_products))
+        return [p for p in filtered_products if p[field] == target]
     
     def sort_products(self, products: List[Dict[str, Any]], sort_by: str) -> List[Dict[str, Any]]:
         """Sort products based on the specified criteria."""
-        if sort_by == "price_asc":
-            return sorted(products, key=lambda p: p["price"])
-        elif sort_by == "price_desc":
-            return sorted(products, key=lambda p: p["price"], reverse=True)
-        elif sort_by == "rating_asc":
-            return sorted(products, key=lambda p: p["rating"])
-        elif sort_by == "rating_desc":
-            return sorted(products, key=lambda p: p["rating"], reverse=True)
-        elif sort_by == "name_asc":
-            return sorted(products, key=lambda p: p["name"])
-        elif sort_by == "name_desc":
-            return sorted(products, key=lambda p: p["name"], reverse=True)
-        
-        return products
+        if sort_by not in SORT_FIELDS:
+            return products
+        field, descending = SORT_FIELDS[sort_by]
+        return sorted(products, key=itemgetter(field), reverse=descending)
+    
+    def iter_results(self, user_query: str, criteria: Optional[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield the products `apply_criteria` would return, in the same order.
+        
+        On the Python backend the query plan runs lazily (see QueryPlan.iter_rows), so
+        unsorted queries stream in plan order. Sorted ones read every match anyway: their
+        row ids are collected and sorted, the result is cached and served from there.
+        Ranked and NumPy-backed searches are computed up front (as compact row ids for
+        NumPy) and then iterated. Results already in the result cache are served from it;
+        an unsorted Python scan that runs to the end of its results adds them to the cache,
+        one that is stopped early does not.
+        """
+        if criteria is None or self.text_ranking:
+            if criteria is None and not self.text_ranking:
+                yield from self.products
+            else:
+                yield from self.apply_criteria(user_query, criteria)
+            return
+        
+        if self.engine is not None:
+            rows = self.filter_rows(criteria)
+        elif self.cache is not None:
+            rows = self.cache.get(criteria, self.catalog_version)
+        else:
+            rows = None
+        if rows is not None:
+            products = self.products
+            for row in rows:
+                yield products[row]
+            return
+        
+        if criteria.get("find_extreme"):
+            yield from self._stream_rows(criteria, self._iter_extreme_rows(criteria))
+            return
+        
+        products = self.products
+        matches = self.plan_query(criteria).iter_rows(products)
+        limit = criteria.get("limit")
+        limit = limit if limit is not None and limit > 0 else None
+        
+        if criteria.get("sort_by") in SORT_FIELDS:
+            rows = self._sort_rows(array("q", matches), criteria["sort_by"])[:limit]
+            if self.cache is not None:
+                self.cache.put(criteria, self.catalog_version, rows)
+            yield from map(products.__getitem__, rows)
+            return
+        
+        yield from self._stream_rows(criteria, islice(matches, limit))
+    
+    def _stream_rows(self, criteria: Dict[str, Any], rows: Iterable[int]) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the products at `rows`. If the consumer reads to the end, the row ids are
+        cached for `criteria` (unless they exceed the cache's row budget).
+        """
+        products = self.products
+        cache = self.cache
+        if cache is None:
+            for row in rows:
+                yield products[row]
+            return
+        
+        version = self.catalog_version
+        seen = array("q")
+        for row in rows:
+            if seen is not None:
+                seen.append(row)
+                if len(seen) > cache.max_rows:
+                    seen = None  # too large to cache; stop collecting
+            yield products[row]
+        if seen is not None and version == self.catalog_version:
+            cache.put(criteria, version, seen)
+    
+    def _iter_extreme_rows(self, criteria: Dict[str, Any]) -> Iterator[int]:
+        """Two-pass, constant-memory equivalent of the `find_extreme` stage, as row ids."""
+        products = self.products
+        plan = self.plan_query(criteria)
+        extreme_type = criteria["find_extreme"]
+        if extreme_type not in EXTREME_FIELDS:
+            yield from plan.iter_rows(products)
+            return
+        
+        field, pick = EXTREME_FIELDS[extreme_type]
+        target = pick((products[row][field] for row in plan.iter_rows(products)), default=None)
+        if target is None:
+            return
+        yield from (row for row in plan.iter_rows(products) if products[row][field] == target)
+    
+    def encode_cursor(self, user_query: str, criteria: Optional[Dict[str, Any]], offset: int) -> str:
+        """Opaque cursor carrying everything needed to fetch the page starting at `offset`."""
+        state = {"q": user_query, "c": criteria, "o": offset, "n": len(self.products), "v": self.catalog_version}
+        return base64.urlsafe_b64encode(json.dumps(state, separators=(",", ":")).encode()).decode()
+    
+    def decode_cursor(self, cursor: str):
+        """Return (user_query, criteria, offset) from a cursor made by `encode_cursor`."""
+        try:
+            state = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            user_query, criteria, offset = state["q"], state["c"], int(state["o"])
+            size, version = state["n"], state["v"]
+        except (ValueError, KeyError, TypeError):
+            raise ValueError("Invalid cursor.")
+        if size != len(self.products) or version != self.catalog_version:
+            raise ValueError("Cursor has expired because the product catalog has changed.")
+        return user_query, criteria, offset
+    
+    def search_page(self, user_query: Optional[str] = None, cursor: Optional[str] = None,
+                    page_size: int = 20) -> Dict[str, Any]:
+        """
+        Return one page of results: {"products", "offset", "next_cursor"}.
+        
+        The first call takes the query and makes one OpenAI call; following pages pass
+        `cursor` and reuse the extracted criteria without calling the API again.
+        `next_cursor` is None on the last page.
+        """
+        if cursor:
+            user_query, criteria, offset = self.decode_cursor(cursor)
+        else:
+            criteria = self.extract_criteria(user_query)
+            offset = 0
+        
+        stop = offset + page_size + 1  # one extra row tells us whether another page exists
+        with self.tracer.span("filter.page", offset=offset) as span:
+            window = list(islice(self.iter_results(user_query, criteria), offset, stop))
+            span.set(rows_out=min(len(window), page_size))
+        
+        has_more = len(window) > page_size
+        return {
+            "products": window[:page_size],
+            "offset": offset,
+            "next_cursor": self.encode_cursor(user_query, criteria, offset + page_size) if has_more else None,
+        }
+    
+    def iter_result_lines(self, products: Iterable[Dict[str, Any]], start: int = 1) -> Iterator[str]:
+        """Yield one formatted result line per product, numbered from `start`."""
+        for i, product in enumerate(products, start):
+            stock_status = "In Stock" if product["in_stock"] else "Out of Stock"
+            yield f"{i}. {product['name']} - ${product['price']:.2f}, Rating: {product['rating']}, {stock_status}\n"
     
     def format_results(self, products: List[Dict[str, Any]]) -> str:
         """Format the filtered products for display."""
         if not products:
             return "No products found matching your criteria."
         
-        result = f"Filtered Products:\n"
-        for i, product in enumerate(products, 1):
-            stock_status = "In Stock" if product["in_stock"] else "Out of Stock"
-            result += f"{i}. {product['name']} - ${product['price']:.2f}, Rating: {product['rating']}, {stock_status}\n"
+        return "Filtered Products:\n" + "".join(self.iter_result_lines(products))
+    
+    def write_results(self, products: Iterable[Dict[str, Any]], stream=None, start: int = 1,
+                      json_lines: bool = False) -> int:
+        """Write products to `stream` (default stdout) row by row; returns the number written."""
+        stream = stream or sys.stdout
+        lines = (json.dumps(p) + "\n" for p in products) if json_lines else self.iter_result_lines(products, start)
+        count = 0
+        for line in lines:
+            stream.write(line)
+            count += 1
+        return count
+    
+    def print_page(self, page: Dict[str, Any], page_size: int):
+        """Print one page of results in the REPL format."""
+        if not page["products"]:
+            print("\nNo products found matching your criteria.\n")
+            return
         
-        return result
+        print("\nFiltered Products:" if page["offset"] == 0 else "")
+        self.write_results(page["products"], start=page["offset"] + 1)
+        if page["next_cursor"]:
+            print(f"\nType 'more' to see the next {page_size} results.")
+        print()
     
-    def run(self):
-        """Main application loop."""
+    def run_batch(self, user_query: str, json_lines: bool = False) -> int:
+        """Run one query and stream every result to stdout; returns the number of results."""
+        criteria = self.extract_criteria(user_query)
+        if not json_lines:
+            print("Filtered Products:")
+        count = self.write_results(self.iter_results(user_query, criteria), json_lines=json_lines)
+        if count == 0 and not json_lines:
+            print("No products found matching your criteria.")
+        return count
+    
+    def print_cache_stats(self):
+        """Print result cache hit/miss counters and memory use."""
+        if self.cache is None:
+            return
+        stats = self.cache.stats()
+        print(f"Result cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.0%}), {stats['entries']} entries, "
+              f"{stats['rows']} rows, {stats['bytes'] / 1024:.1f} KiB, catalog v{self.catalog_version}")
+    
+    def run(self, profile: bool = False, page_size: int = 20):
+        """Main application loop. With `profile`, print a stage breakdown after each search."""
         print("🔍 Product Search Tool")
         print("=" * 50)
         print("Enter your product search request in natural language.")
@@ -276,8 +638,10 @@ Examples:
         print('- "Show me fitness equipment under $100"')
         print('- "Find electronics with rating above 4.5"')
         print('- "I want books about programming"')
-        print("\nType 'quit' to exit.\n")
+        print("\nType 'more' for the next page of results, 'explain <query>' to show the query plan,")
+        print("'reload' to re-read the products file, 'quit' to exit.\n")
         
+        next_cursor = None
         while True:
             try:
                 user_input = input("🔍 Search: ").strip()
@@ -290,10 +654,32 @@ Examples:
                     print("Please enter a search query.\n")
                     continue
                 
-                print("Searching...")
-                filtered_products = self.search_products(user_input)
-                result = self.format_results(filtered_products)
-                print(f"\n{result}\n")
+                if user_input.lower() == 'reload':
+                    self.reload_products()
+                    next_cursor = None
+                    print(f"Reloaded {len(self.products)} products.\n")
+                    continue
+                
+                if user_input.lower().startswith('explain '):
+                    print(f"\n{self.explain(self.extract_criteria(user_input[len('explain '):]))}\n")
+                    continue
+                
+                first_span = len(self.tracer.spans)
+                if user_input.lower() in ['more', 'm']:
+                    if not next_cursor:
+                        print("No more results. Enter a new search.\n")
+                        continue
+                    page = self.search_page(cursor=next_cursor, page_size=page_size)
+                else:
+                    print("Searching...")
+                    page = self.search_page(user_input, page_size=page_size)
+                next_cursor = page["next_cursor"]
+                self.print_page(page, page_size)
+                
+                if profile:
+                    self.tracer.print_profile(self.tracer.spans[first_span:])
+                    self.print_cache_stats()
+                    print()
                 
             except KeyboardInterrupt:
                 print("\n\nThank you for using Product Search Tool!")
@@ -303,20 +689,79 @@ Examples:
 
 def main():
     """Entry point of the application."""
-    # Check if products file exists
-    if len(sys.argv) > 1:
-        products_file = sys.argv[1]
-    else:
-        products_file = "products.json"
+    parser = argparse.ArgumentParser(
+        description="Search products using natural language queries")
+    parser.add_argument(
+        'products_file', nargs='?', default="products.json",
+        help='Path to the products JSON file (default: products.json)')
+    parser.add_argument(
+        '--backend', choices=["python", "numpy", "sharded"], default="python",
+        help='Filter engine; numpy and sharded (multi-process) suit very large catalogs (default: python)')
+    parser.add_argument(
+        '--workers', type=int,
+        help='Worker processes for the sharded backend (default: CPU count)')
+    parser.add_argument(
+        '--rank', action='store_true',
+        help='Rank results by text relevance (BM25) instead of exact keyword matching')
+    parser.add_argument(
+        '--query', '-q',
+        help='Run a single search, stream all results to stdout and exit')
+    parser.add_argument(
+        '--json', action='store_true',
+        help='With --query, write results as JSON Lines (one product per line)')
+    parser.add_argument(
+        '--explain', action='store_true',
+        help='With --query, print the query plan with row counts per step instead of the results')
+    parser.add_argument(
+        '--page-size', type=int, default=20,
+        help='Results per page in interactive mode (default: 20)')
+    parser.add_argument(
+        '--cache-size', type=int, default=256,
+        help='Filter results to keep in the result cache; 0 disables it (default: 256)')
+    parser.add_argument(
+        '--profile', action='store_true',
+        help='Print a per-stage timing breakdown and cache statistics after each search')
+    parser.add_argument(
+        '--trace',
+        help='Export a trace on exit (.jsonl for JSONL, otherwise Chrome trace format)')
+    
+    args = parser.parse_args()
+    products_file = args.products_file
     
+    # Check if products file exists
     if not os.path.exists(products_file):
         print(f"Error: Products file '{products_file}' not found.")
         print("Usage: python product_search.py [products_file.json]")
         sys.exit(1)
     
     # Create and run the search tool
-    search_tool = ProductSearchTool(products_file)
-    search_tool.run()
+    tracer = Tracer(enabled=args.profile or bool(args.trace))
+    try:
+        search_tool = ProductSearchTool(products_file, tracer=tracer, backend=args.backend,
+                                        text_ranking=args.rank, workers=args.workers,
+                                        cache_size=args.cache_size)
+    except ImportError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    
+    try:
+        if args.query and args.explain:
+            print(search_tool.explain(search_tool.extract_criteria(args.query)))
+        elif args.query:
+            search_tool.run_batch(args.query, json_lines=args.json)
+            if args.profile:
+                search_tool.tracer.print_profile()
+                search_tool.print_cache_stats()
+        else:
+            search_tool.run(profile=args.profile, page_size=args.page_size)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        search_tool.close()
+    
+    if args.trace:
+        print(f"Trace saved to: {tracer.export(args.trace)}")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
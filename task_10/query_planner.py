@@ -0,0 +1,320 @@
+"""
+Query Planner
+
+Statistics-driven planning for the pure-Python filter backend. Instead of
+always applying the predicates in the order category, price, rating,
+stock, keywords, the planner estimates how many rows each predicate keeps
+and
+
+- picks an access path: a full scan, the category index, or a price/rating
+  range index when a range is selective enough to be worth it
+- applies the remaining predicates most selective first, so that expensive
+  scans run over as few rows as possible
+
+Estimates come from per-column statistics, each computed on first use:
+category counts, the in-stock count, equi-depth price/rating histograms and
+document frequencies of the words in product names (the last two from an
+evenly spaced sample of at most `SAMPLE_SIZE` rows). Rows always come out in
+catalog order, so plans never change the result, only the cost.
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Rows used for the histograms and name word frequencies
+SAMPLE_SIZE = 100_000
+
+# A range index is used only when the range is estimated to keep at most this
+# fraction of the catalog; above that a scan is cheaper than sorting the row ids
+RANGE_INDEX_MAX_FRACTION = 0.2
+
+# Rows a streamed plan runs through its filters at a time
+STREAM_CHUNK_ROWS = 4096
+
+# (criteria key, product field, comparison) for the range predicates
+RANGE_BOUNDS = [
+    ("max_price", "price", "<="),
+    ("min_price", "price", ">="),
+    ("min_rating", "rating", ">="),
+    ("max_rating", "rating", "<="),
+]
+
+
+class CatalogStatistics:
+    def __init__(self, products: List[Dict[str, Any]], buckets: int = 64):
+        """Lazily computed statistics and indexes over `products`."""
+        self.products = products
+        self.size = len(products)
+        self.buckets = buckets
+        self.sample = products[::max(1, -(-self.size // SAMPLE_SIZE))]
+        self._category_counts = None
+        self._in_stock_count = None
+        self._histograms = {}
+        self._name_df = None
+        self._keyword_fractions = {}
+        self._category_rows = None
+        self._range_indexes = {}
+
+    @property
+    def category_counts(self) -> Dict[str, int]:
+        """Number of products per category."""
+        if self._category_counts is None:
+            counts = {}
+            for product in self.products:
+                counts[product["category"]] = counts.get(product["category"], 0) + 1
+            self._category_counts = counts
+        return self._category_counts
+
+    @property
+    def in_stock_count(self) -> int:
+        """Number of products in stock."""
+        if self._in_stock_count is None:
+            self._in_stock_count = sum(1 for p in self.products if p["in_stock"])
+        return self._in_stock_count
+
+    def histogram(self, field: str) -> List[float]:
+        """Equi-depth histogram of a numeric field: `buckets + 1` quantile boundaries."""
+        if field not in self._histograms:
+            values = sorted(p[field] for p in self.sample)
+            if values:
+                last = len(values) - 1
+                bounds = [values[last * i // self.buckets] for i in range(self.buckets + 1)]
+            else:
+                bounds = []
+            self._histograms[field] = bounds
+        return self._histograms[field]
+
+    def _fraction_below(self, field: str, value: float, inclusive: bool) -> float:
+        """Estimated fraction of rows with `field` < value (<= with `inclusive`)."""
+        bounds = self.histogram(field)
+        if not bounds:
+            return 0.0
+        passed = bisect_right(bounds, value) if inclusive else bisect_left(bounds, value)
+        if passed == 0:
+            return 0.0
+        if passed == len(bounds):
+            return 1.0
+        # bounds[i] <= value < bounds[i + 1]: interpolate linearly inside bucket i
+        i = passed - 1
+        within = (value - bounds[i]) / (bounds[i + 1] - bounds[i])
+        return (i + within) / (len(bounds) - 1)
+
+    def range_fraction(self, field: str, low: Optional[float] = None, high: Optional[float] = None) -> float:
+        """Estimated fraction of rows with low <= field <= high (either bound optional)."""
+        upper = 1.0 if high is None else self._fraction_below(field, high, inclusive=True)
+        lower = 0.0 if low is None else self._fraction_below(field, low, inclusive=False)
+        return max(0.0, upper - lower)
+
+    @property
+    def name_document_frequencies(self) -> Dict[str, int]:
+        """Number of sampled product names containing each word."""
+        if self._name_df is None:
+            df = {}
+            for product in self.sample:
+                for token in set(TOKEN_PATTERN.findall(product["name"].lower())):
+                    df[token] = df.get(token, 0) + 1
+            self._name_df = df
+        return self._name_df
+
+    def keyword_fraction(self, keyword: str) -> float:
+        """
+        Estimated fraction of names containing `keyword` as a substring: for each of
+        its words, the summed frequency of the name words that contain it (an upper
+        bound), and the rarest word of a multi-word keyword.
+        """
+        keyword = keyword.lower()
+        if keyword not in self._keyword_fractions:
+            fraction = 1.0
+            if self.size:
+                df = self.name_document_frequencies
+                for part in TOKEN_PATTERN.findall(keyword):
+                    matches = sum(count for token, count in df.items() if part in token)
+                    fraction = min(fraction, matches / len(self.sample))
+            self._keyword_fractions[keyword] = fraction
+        return self._keyword_fractions[keyword]
+
+    def category_rows(self, category: str) -> List[int]:
+        """Row ids of a category, in catalog order (the category index)."""
+        if self._category_rows is None:
+            index = {}
+            for row, product in enumerate(self.products):
+                index.setdefault(product["category"], []).append(row)
+            self._category_rows = index
+        return self._category_rows.get(category, [])
+
+    def range_rows(self, field: str, low: Optional[float] = None, high: Optional[float] = None) -> List[int]:
+        """Row ids with low <= field <= high, in catalog order (the range index)."""
+        if field not in self._range_indexes:
+            column = [p[field] for p in self.products]
+            order = sorted(range(self.size), key=column.__getitem__)
+            self._range_indexes[field] = (order, list(map(column.__getitem__, order)))
+        order, values = self._range_indexes[field]
+        start = 0 if low is None else bisect_left(values, low)
+        end = len(values) if high is None else bisect_right(values, high)
+        return sorted(order[start:end])
+
+
+class PlanStep:
+    def __init__(self, description: str, estimate: Optional[int] = None, span: Optional[str] = None,
+                 select: Optional[Callable[[List[Dict[str, Any]], Iterable[int]], List[int]]] = None):
+        """
+        One step of a plan; `select(products, rows)` returns the row ids that pass it,
+        in order. `rows` is filled in when the plan runs.
+        """
+        self.description = description
+        self.estimate = estimate
+        self.span = span
+        self.select = select
+        self.rows = None
+
+
+class QueryPlan:
+    def __init__(self, criteria: Dict[str, Any], access: PlanStep, access_rows: Optional[Callable[[], List[int]]],
+                 filters: List[PlanStep]):
+        """Access path (`access_rows` None means a full scan) followed by ordered filters."""
+        self.criteria = criteria
+        self.access = access
+        self.access_rows = access_rows
+        self.filters = filters
+        self.steps = [access] + filters
+
+    def execute_rows(self, products: List[Dict[str, Any]], tracer) -> List[int]:
+        """Run the access path and filters; returns the row ids of the matches in catalog order."""
+        if self.access_rows is None:
+            rows = range(len(products))
+        else:
+            with tracer.span(self.access.span) as span:
+                rows = self.access_rows()
+                span.set(rows_out=len(rows))
+        self.access.rows = len(rows)
+
+        for step in self.filters:
+            with tracer.span(step.span) as span:
+                rows = step.select(products, rows)
+                span.set(rows_out=len(rows))
+            step.rows = len(rows)
+        return rows if self.filters else list(rows)  # a fresh list, never the index's own
+
+    def iter_rows(self, products: List[Dict[str, Any]]) -> Iterator[int]:
+        """
+        Lazily yield the row ids of the matches in catalog order, running the filters in
+        planned order over `STREAM_CHUNK_ROWS` rows of the access path at a time.
+        Nothing is traced and no row counts are recorded.
+        """
+        rows = range(len(products)) if self.access_rows is None else self.access_rows()
+        for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+            chunk = rows[start:start + STREAM_CHUNK_ROWS]
+            for step in self.filters:
+                chunk = step.select(products, chunk)
+            yield from chunk
+
+    def add_step(self, description: str, rows: int):
+        """Record a step applied after filtering (extreme value, sort, limit)."""
+        step = PlanStep(description)
+        step.rows = rows
+        self.steps.append(step)
+
+    def explain(self) -> str:
+        """The plan as text, with estimated and (once run) actual rows per step."""
+        lines = []
+        for i, step in enumerate(self.steps, 1):
+            estimate = "" if step.estimate is None else f"{step.estimate:,}"
+            rows = "" if step.rows is None else f"{step.rows:,}"
+            lines.append(f"{i:>3}. {step.description:<44} {estimate:>12} {rows:>12}")
+        header = f"{'':>3}  {'Step':<44} {'Est. rows':>12} {'Rows':>12}"
+        return "\n".join([header, "-" * len(header)] + lines)
+
+
+class QueryPlanner:
+    def __init__(self, statistics: CatalogStatistics):
+        """Plan filter queries using `statistics`."""
+        self.statistics = statistics
+
+    def plan(self, criteria: Dict[str, Any]) -> QueryPlan:
+        """
+        Plan the filter stage of `criteria`. With `find_extreme` set, only the
+        predicates applied before the extreme value is picked are planned.
+        """
+        stats = self.statistics
+        size = stats.size
+        extreme = bool(criteria.get("find_extreme"))
+
+        # Candidate predicates: (estimated fraction, criteria key, step)
+        predicates = []
+        category = criteria.get("category")
+        category_fraction = stats.category_counts.get(category, 0) / size if category and size else 0.0
+        if category:
+            predicates.append((category_fraction, "category",
+                               PlanStep(f"category = {category!r}", span="filter.category",
+                                        select=lambda products, rows: [row for row in rows
+                                                                       if products[row]["category"] == category])))
+
+        ranges = {}
+        if not extreme:
+            for key, field, op in RANGE_BOUNDS:
+                if criteria.get(key) is None:
+                    continue
+                bound = criteria[key]
+                if op == "<=":
+                    fraction = stats.range_fraction(field, high=bound)
+                    select = lambda products, rows, field=field, bound=bound: [row for row in rows
+                                                                               if products[row][field] <= bound]
+                else:
+                    fraction = stats.range_fraction(field, low=bound)
+                    select = lambda products, rows, field=field, bound=bound: [row for row in rows
+                                                                               if products[row][field] >= bound]
+                predicates.append((fraction, key, PlanStep(f"{field} {op} {bound}", span=f"filter.{key}",
+                                                           select=select)))
+                ranges.setdefault(field, {})[key] = bound
+
+        if criteria.get("in_stock_only"):
+            fraction = stats.in_stock_count / size if size else 0.0
+            predicates.append((fraction, "in_stock_only",
+                               PlanStep("in stock", span="filter.in_stock",
+                                        select=lambda products, rows: [row for row in rows
+                                                                       if products[row]["in_stock"]])))
+
+        for keyword in criteria.get("keywords") or []:
+            needle = keyword.lower()
+            predicates.append((stats.keyword_fraction(needle), "keywords",
+                               PlanStep(f"name contains {needle!r}", span="filter.keywords",
+                                        select=lambda products, rows, needle=needle: [
+                                            row for row in rows if needle in products[row]["name"].lower()])))
+
+        # Access path: the cheapest of a full scan and the applicable indexes
+        access = PlanStep("full scan", estimate=size)
+        access_rows = None
+        best = 1.0
+        consumed = set()
+        if category:
+            access = PlanStep(f"category index: {category!r}", estimate=round(category_fraction * size),
+                              span="filter.category_index")
+            access_rows = lambda: stats.category_rows(category)
+            best = category_fraction
+            consumed = {"category"}
+        for field, bounds in ranges.items():
+            low = bounds.get("min_price" if field == "price" else "min_rating")
+            high = bounds.get("max_price" if field == "price" else "max_rating")
+            fraction = stats.range_fraction(field, low, high)
+            if fraction <= RANGE_INDEX_MAX_FRACTION and fraction < best:
+                conditions = [f"{field} >= {low}"] if low is not None else []
+                conditions += [f"{field} <= {high}"] if high is not None else []
+                access = PlanStep(f"{field} range index: {' and '.join(conditions)}", estimate=round(fraction * size),
+                                  span=f"filter.{field}_index")
+                access_rows = lambda field=field, low=low, high=high: stats.range_rows(field, low, high)
+                best = fraction
+                consumed = set(bounds)
+
+        # Remaining predicates, most selective first; estimates assume independence
+        filters = []
+        remaining = best
+        for fraction, key, step in sorted(predicates, key=lambda p: p[0]):
+            if key in consumed:
+                continue
+            remaining *= fraction
+            step.estimate = round(remaining * size)
+            filters.append(step)
+        return QueryPlan(criteria, access, access_rows, filters)
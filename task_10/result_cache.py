@@ -0,0 +1,113 @@
+"""
+Result Cache
+
+LRU cache of filter results keyed by a canonical fingerprint of the
+criteria plus the catalog version. Entries store row ids in a compact
+`array('q')` rather than product copies, and memory is bounded both by
+entry count and by the total number of cached rows. Bumping the catalog
+version (or calling `invalidate`) drops every entry.
+"""
+
+import json
+import threading
+from array import array
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Iterable
+
+# Criteria fields and how their values are normalized; anything else is
+# ignored by filter_products and therefore left out of the fingerprint
+NUMERIC_FIELDS = ("max_price", "min_price", "min_rating", "max_rating")
+TEXT_FIELDS = ("category", "sort_by", "find_extreme")
+
+
+def fingerprint(criteria: Dict[str, Any]) -> str:
+    """
+    Canonical string for a criteria dict: values that filter_products treats as
+    "not set" are dropped, numbers are floats and keywords are lower-cased,
+    de-duplicated and sorted (they are matched case-insensitively and all must match).
+    """
+    canonical = {}
+    for field in NUMERIC_FIELDS:
+        if criteria.get(field) is not None:
+            canonical[field] = float(criteria[field])
+    for field in TEXT_FIELDS:
+        if criteria.get(field):
+            canonical[field] = criteria[field]
+    if criteria.get("in_stock_only"):
+        canonical["in_stock_only"] = True
+    if criteria.get("keywords"):
+        canonical["keywords"] = sorted({keyword.lower() for keyword in criteria["keywords"]})
+    if criteria.get("limit") is not None and criteria["limit"] > 0:
+        canonical["limit"] = int(criteria["limit"])
+    return json.dumps(canonical, sort_keys=True, separators=(",", ":"))
+
+
+class ResultCache:
+    def __init__(self, max_entries: int = 256, max_rows: int = 1_000_000):
+        """Cache at most `max_entries` results holding `max_rows` row ids in total."""
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self._entries = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, criteria: Dict[str, Any], version: int) -> Optional[array]:
+        """Cached row ids for `criteria` at catalog `version`, or None."""
+        key = (fingerprint(criteria), version)
+        with self._lock:
+            rows = self._entries.get(key)
+            if rows is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return rows
+
+    def put(self, criteria: Dict[str, Any], version: int, rows: Iterable[int]):
+        """Store row ids; results larger than the whole row budget are not cached."""
+        stored = array("q")
+        if hasattr(rows, "astype"):  # numpy array
+            stored.frombytes(rows.astype("int64").tobytes())
+        else:
+            stored.extend(rows)
+        if len(stored) > self.max_rows:
+            return
+
+        key = (fingerprint(criteria), version)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._rows -= len(previous)
+            self._entries[key] = stored
+            self._rows += len(stored)
+            while len(self._entries) > self.max_entries or self._rows > self.max_rows:
+                _, evicted = self._entries.popitem(last=False)
+                self._rows -= len(evicted)
+                self.evictions += 1
+
+    def invalidate(self):
+        """Drop all entries (called when the catalog changes)."""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._rows = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current memory use."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+                "rows": self._rows,
+                "bytes": self._rows * array("q").itemsize + sum(len(k[0]) for k in self._entries),
+            }
@@ -0,0 +1,210 @@
+"""
+Sharded Catalog
+
+Multi-process filter backend for very large catalogs. The catalog columns
+(price, rating, stock, category code, name rank and lower-cased names) are
+copied once into a single shared-memory block. Worker processes attach to
+it read-only; each query is scattered as one task per shard (a contiguous
+row range) and the partial row ids are merged here:
+
+- unsorted results are concatenated in shard order, i.e. catalog order
+- sorted results are merged on (sort key, row id), matching Python's
+  stable sort, and cut to the limit (each shard already returns its own top-K)
+- extreme-value queries keep the rows of the shards holding the global extreme
+
+Each shard is evaluated by a NumpyFilterEngine over zero-copy views, so
+results are identical to the numpy and pure-Python backends. Shards are
+pinned to workers (shard i always runs in worker i % workers), so what a
+shard engine builds lazily, such as the decoded names for keyword queries,
+exists in one process only instead of in every worker.
+"""
+
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Dict, Any, Optional
+
+from criteria_fields import SORT_FIELDS, EXTREME_FIELDS
+from numpy_filter import NumpyFilterEngine, np
+from tracing import Tracer
+
+# (column name, dtype, length offset) -- name_offsets has one extra entry
+COLUMNS = [
+    ("price", "float64", 0),
+    ("rating", "float64", 0),
+    ("name_rank", "int64", 0),
+    ("name_offsets", "int64", 1),
+    ("category", "int32", 0),
+    ("in_stock", "bool", 0),
+]
+
+
+def _column_views(buffer, layout):
+    """NumPy views over the shared block for every entry of `layout`."""
+    return {name: np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+            for name, (dtype, shape, offset) in layout.items()}
+
+
+# Per-worker state, set by _attach_worker in each pool process
+_worker = {}
+
+
+def _attach_worker(block_name, layout, category_codes, bounds):
+    block = shared_memory.SharedMemory(name=block_name)
+    _worker["block"] = block  # keep the mapping alive for the process lifetime
+    _worker["columns"] = _column_views(block.buf, layout)
+    _worker["category_codes"] = category_codes
+    _worker["bounds"] = bounds
+    _worker["engines"] = {}
+
+
+def _shard_engine(shard):
+    engine = _worker["engines"].get(shard)
+    if engine is None:
+        lo, hi = _worker["bounds"][shard]
+        columns = _worker["columns"]
+
+        def load_names():
+            offsets = columns["name_offsets"]
+            blob = bytes(columns["names"][offsets[lo]:offsets[hi]])
+            base = offsets[lo]
+            return [blob[offsets[i] - base:offsets[i + 1] - base].decode("utf-8") for i in range(lo, hi)]
+
+        engine = NumpyFilterEngine.from_columns(
+            columns["price"][lo:hi], columns["rating"][lo:hi], columns["in_stock"][lo:hi],
+            columns["category"][lo:hi], _worker["category_codes"], columns["name_rank"][lo:hi],
+            load_names)
+        _worker["engines"][shard] = engine
+    return engine
+
+
+def _shard_rows(shard, criteria):
+    """Matching global row ids for one shard (sorted/limited per shard)."""
+    lo, _ = _worker["bounds"][shard]
+    return _shard_engine(shard).filter_rows(criteria) + lo
+
+
+def _release(executors, block):
+    for executor in executors:
+        executor.shutdown(wait=True, cancel_futures=True)
+    block.close()
+    block.unlink()
+
+
+class ShardedCatalog:
+    def __init__(self, products: List[Dict[str, Any]], workers: Optional[int] = None,
+                 shards: Optional[int] = None, tracer: Optional[Tracer] = None):
+        """
+        Copy the catalog columns into shared memory and start `workers` processes
+        (default: CPU count, at most one per shard). The catalog is split into
+        `shards` row ranges (default: one per worker).
+        """
+        if np is None:
+            raise ImportError("The sharded backend requires numpy. Install it with: pip install numpy")
+
+        self.products = products
+        self.tracer = tracer or Tracer()
+        self.workers = workers or os.cpu_count() or 1
+        shard_count = max(1, min(shards or self.workers, len(products) or 1))
+
+        with self.tracer.span("catalog.shard", rows=len(products), shards=shard_count):
+            columns = NumpyFilterEngine(products)
+            names = [p["name"].lower().encode("utf-8") for p in products]
+            name_offsets = np.zeros(len(products) + 1, dtype=np.int64)
+            np.cumsum([len(n) for n in names], out=name_offsets[1:])
+
+            # Lay the columns out back to back, 8-byte aligned
+            self.layout = {}
+            offset = 0
+            for name, dtype, extra in COLUMNS:
+                self.layout[name] = (dtype, (len(products) + extra,), offset)
+                offset += -(-np.dtype(dtype).itemsize * (len(products) + extra) // 8) * 8
+            self.layout["names"] = ("uint8", (int(name_offsets[-1]),), offset)
+            offset += int(name_offsets[-1])
+
+            self.block = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+            self.columns = _column_views(self.block.buf, self.layout)
+            self.columns["price"][:] = columns.price
+            self.columns["rating"][:] = columns.rating
+            self.columns["name_rank"][:] = columns.name_rank
+            self.columns["name_offsets"][:] = name_offsets
+            self.columns["category"][:] = columns.category
+            self.columns["in_stock"][:] = columns.in_stock
+            if len(self.columns["names"]):
+                self.columns["names"][:] = np.frombuffer(b"".join(names), dtype=np.uint8)
+            self.category_codes = columns.category_codes
+            del columns, names
+
+        step = -(-len(products) // shard_count) if products else 0
+        self.bounds = [(min(i * step, len(products)), min((i + 1) * step, len(products)))
+                       for i in range(shard_count)]
+
+        # One single-process executor per worker, so each shard always runs in the same process
+        self.executors = [
+            ProcessPoolExecutor(max_workers=1, initializer=_attach_worker,
+                                initargs=(self.block.name, self.layout, self.category_codes, self.bounds))
+            for _ in range(min(self.workers, shard_count))]
+        # Shut the workers down and free the shared block even if close() is never called
+        self._finalizer = weakref.finalize(self, _release, self.executors, self.block)
+
+    def close(self):
+        """Stop the worker processes and release the shared memory."""
+        self.columns = None
+        self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _sort_keys(self, rows, sort_by):
+        field, descending = SORT_FIELDS[sort_by]
+        column = self.columns["name_rank" if field == "name" else field]
+        keys = column[rows].astype(np.float64)
+        return -keys if descending else keys
+
+    def filter_rows(self, criteria: Dict[str, Any]):
+        """Scatter the criteria to all shards and merge the partial row ids."""
+        with self.tracer.span("shard.scatter", shards=len(self.bounds)):
+            executors = self.executors
+            futures = [executors[shard % len(executors)].submit(_shard_rows, shard, criteria)
+                       for shard in range(len(self.bounds))]
+            parts = [future.result() for future in futures]
+
+        with self.tracer.span("shard.merge") as span:
+            rows = self._merge(parts, criteria)
+            span.set(rows_out=len(rows))
+        return rows
+
+    def _merge(self, parts, criteria):
+        extreme = criteria.get("find_extreme")
+        if extreme:
+            if extreme not in EXTREME_FIELDS:
+                return np.concatenate(parts)
+            field, pick = EXTREME_FIELDS[extreme]
+            column = self.columns[field]
+            heads = [column[part[0]] for part in parts if len(part)]
+            if not heads:
+                return np.empty(0, dtype=np.int64)
+            target = pick(heads)
+            return np.concatenate([part for part in parts if len(part) and column[part[0]] == target])
+
+        rows = np.concatenate(parts)
+        limit = criteria.get("limit")
+        limit = limit if limit is not None and limit > 0 else None
+
+        sort_by = criteria.get("sort_by")
+        if sort_by in SORT_FIELDS:
+            # Primary key: sort key; ties broken by catalog position (stable sort order)
+            rows = rows[np.lexsort((rows, self._sort_keys(rows, sort_by)))]
+        if limit is not None:
+            rows = rows[:limit]
+        return rows
+
+    def filter(self, criteria: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Sharded equivalent of ProductSearchTool.filter_products."""
+        products = self.products
+        return [products[row] for row in self.filter_rows(criteria).tolist()]
@@ -0,0 +1,161 @@
+"""
+Text Index
+
+Offline BM25 relevance ranking over product names and categories. The
+index is a precomputed sparse term-document matrix in CSC layout: column
+`c` (one per term) holds the rows `row_ids[indptr[c]:indptr[c + 1]]` with
+BM25 weights `weights[indptr[c]:indptr[c + 1]]`. Scoring a query is a sum
+over the columns of its terms, restricted to the candidate rows that
+survived the structured filters.
+
+When NumPy is installed, the arrays are scored in vectorized form;
+otherwise a pure-Python loop is used.
+"""
+
+import re
+import math
+from array import array
+from typing import List, Dict, Any, Iterable, Optional
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional; the pure-Python scorer is used instead
+    np = None
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and any are as at be best by can do for from get good great have i in is it me
+my need of on one or show some that the this to under over above below with want
+looking find products product less than more price rating rated stock
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens with stopwords removed and a light plural strip."""
+    tokens = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        if token in STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class TextIndex:
+    def __init__(self, products: List[Dict[str, Any]], k1: float = 1.2, b: float = 0.75):
+        """Build the BM25 index for `products` (row ids are list positions)."""
+        self.products = products
+        self._row_lookup = None  # id(product) -> row, built the first time `rank` gets candidates
+
+        term_counts = []
+        doc_freq = {}
+        total_length = 0
+        for product in products:
+            counts = {}
+            for token in tokenize(f"{product['name']} {product['category']}"):
+                counts[token] = counts.get(token, 0) + 1
+            for token in counts:
+                doc_freq[token] = doc_freq.get(token, 0) + 1
+            term_counts.append(counts)
+            total_length += sum(counts.values())
+
+        doc_count = len(products)
+        avg_length = total_length / doc_count if doc_count else 0.0
+
+        # Column layout: one contiguous slice per term
+        self.vocabulary = {}
+        self.indptr = array("q", [0])
+        offset = 0
+        for column, (token, df) in enumerate(doc_freq.items()):
+            self.vocabulary[token] = column
+            offset += df
+            self.indptr.append(offset)
+
+        idf = [math.log(1 + (doc_count - df + 0.5) / (df + 0.5)) for df in doc_freq.values()]
+        self.row_ids = array("q", bytes(8 * offset))
+        self.weights = array("d", bytes(8 * offset))
+        fill = list(self.indptr[:-1])
+        for row, counts in enumerate(term_counts):
+            if not counts:
+                continue
+            length_norm = k1 * (1 - b + b * sum(counts.values()) / avg_length)
+            for token, tf in counts.items():
+                column = self.vocabulary[token]
+                position = fill[column]
+                fill[column] += 1
+                self.row_ids[position] = row
+                self.weights[position] = idf[column] * tf * (k1 + 1) / (tf + length_norm)
+
+        if np is not None:
+            # Zero-copy views over the same buffers
+            self._np_row_ids = np.frombuffer(self.row_ids, dtype=np.int64)
+            self._np_weights = np.frombuffer(self.weights, dtype=np.float64)
+
+    def query_terms(self, query: str) -> List[str]:
+        """Unique query tokens that occur in the index."""
+        return [t for t in dict.fromkeys(tokenize(query)) if t in self.vocabulary]
+
+    def _candidate_rows(self, candidates: Iterable[Dict[str, Any]]) -> List[int]:
+        if self._row_lookup is None:
+            self._row_lookup = {id(p): i for i, p in enumerate(self.products)}
+        try:
+            # map() keeps the loop in C
+            return list(map(self._row_lookup.__getitem__, map(id, candidates)))
+        except KeyError:
+            raise ValueError("Candidates must be products of the indexed catalog, not copies") from None
+
+    def score(self, query: str, candidate_rows: Optional[Iterable[int]] = None) -> Dict[int, float]:
+        """BM25 scores by row id, for all rows or only the given candidate rows."""
+        if np is not None:
+            rows, scores = self._score_numpy(query, candidate_rows)
+            return dict(zip(rows.tolist(), scores.tolist()))
+
+        allowed = None
+        if candidate_rows is not None:
+            allowed = bytearray(len(self.products))
+            for row in candidate_rows:
+                allowed[row] = 1
+
+        scores = {}
+        for term in self.query_terms(query):
+            column = self.vocabulary[term]
+            start, end = self.indptr[column], self.indptr[column + 1]
+            for row, weight in zip(self.row_ids[start:end], self.weights[start:end]):
+                if allowed is None or allowed[row]:
+                    scores[row] = scores.get(row, 0.0) + weight
+        return scores
+
+    def _score_numpy(self, query, candidate_rows):
+        """Rows with a positive score (ascending) and their scores."""
+        scores = np.zeros(len(self.products), dtype=np.float64)
+        for term in self.query_terms(query):
+            column = self.vocabulary[term]
+            start, end = self.indptr[column], self.indptr[column + 1]
+            # Each row appears at most once per column, so fancy-index add is safe
+            scores[self._np_row_ids[start:end]] += self._np_weights[start:end]
+
+        if candidate_rows is not None:
+            allowed = np.zeros(len(self.products), dtype=bool)
+            allowed[np.asarray(candidate_rows, dtype=np.int64)] = True
+            scores[~allowed] = 0.0
+
+        rows = np.flatnonzero(scores > 0)
+        return rows, scores[rows]
+
+    def rank_rows(self, query: str, candidate_rows: Optional[Iterable[int]] = None) -> List[int]:
+        """Row ids matching at least one query term, best match first (ties keep catalog order)."""
+        if np is not None:
+            rows, scores = self._score_numpy(query, candidate_rows)
+            return rows[np.argsort(-scores, kind="stable")].tolist()
+        scores = self.score(query, candidate_rows)
+        return sorted(scores, key=lambda row: (-scores[row], row))
+
+    def rank(self, query: str, candidates: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+        """
+        Like `rank_rows`, but takes and returns product dicts. Candidates must be the
+        catalog's own product dicts; prefer `rank_rows` where row ids are at hand.
+        """
+        candidate_rows = None if candidates is None else self._candidate_rows(candidates)
+        return [self.products[row] for row in self.rank_rows(query, candidate_rows)]
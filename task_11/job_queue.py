@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Durable Job Queue for Audio Processing
+SQLite-backed queue that lets several worker processes transcribe, summarize
+and analyze audio files concurrently, with a checkpoint after every stage
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import multiprocessing
+
+# Stage checkpoints, in pipeline order; a job records the last one it completed
+STAGES = ("queued", "transcribed", "summarized", "analyzed", "saved")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    audio_file TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',      -- queued, running, done, failed
+    stage TEXT NOT NULL DEFAULT 'queued',       -- last completed checkpoint
+    attempts INTEGER NOT NULL DEFAULT 0,
+    available_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_expires REAL,
+    transcript TEXT,
+    summary TEXT,
+    analytics TEXT,
+    files TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (status, available_at);
+"""
+
+
+class LeaseLost(Exception):
+    """Raised when a worker's lease on a job expired and another worker took it over"""
+
+
+class JobQueue:
+    def __init__(self, path="jobs.db", lease_seconds=600, max_attempts=3, retry_delay=5.0):
+        """
+        Open (or create) the queue database at `path`. A claimed job is leased for
+        `lease_seconds` and the lease is renewed at every checkpoint, so it must
+        cover the longest single stage. Failed or stuck jobs are retried up to
+        `max_attempts` times, waiting `retry_delay` seconds (doubling) in between.
+        """
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        # Autocommit mode; multi-statement updates use explicit transactions
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        """Close the database connection"""
+        self.db.close()
+
+    def enqueue(self, audio_files):
+        """Add one job per audio file; returns the new job ids"""
+        now = time.time()
+        ids = []
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            for audio_file in audio_files:
+                cursor = self.db.execute(
+                    "INSERT INTO jobs (audio_file, available_at, created_at) VALUES (?, ?, ?)",
+                    (os.path.abspath(audio_file), now, now))
+                ids.append(cursor.lastrowid)
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        return ids
+
+    def claim(self, worker_id):
+        """
+        Lease the next runnable job to `worker_id`: a queued job whose retry delay
+        has passed, or a running job whose lease expired (its worker died or hung).
+        Returns the job row as a dict, or None if nothing is runnable.
+        """
+        while True:
+            now = time.time()
+            # IMMEDIATE takes the write lock up front, so two workers never claim the same job
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.db.execute(
+                    "SELECT * FROM jobs WHERE (status = 'queued' AND available_at <= ?)"
+                    " OR (status = 'running' AND lease_expires < ?) ORDER BY id LIMIT 1",
+                    (now, now)).fetchone()
+                if row is None:
+                    self.db.execute("COMMIT")
+                    return None
+
+                if row["status"] == "running" and row["attempts"] >= self.max_attempts:
+                    self.db.execute(
+                        "UPDATE jobs SET status = 'failed', lease_owner = NULL, finished_at = ?,"
+                        " error = ? WHERE id = ?",
+                        (now, f"Lease expired on attempt {row['attempts']}", row["id"]))
+                    self.db.execute("COMMIT")
+                    continue
+
+                self.db.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?,"
+                    " lease_expires = ?, started_at = COALESCE(started_at, ?) WHERE id = ?",
+                    (worker_id, now + self.lease_seconds, now, row["id"]))
+                self.db.execute("COMMIT")
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+
+            job = dict(row)
+            job["attempts"] += 1
+            job["analytics"] = json.loads(job["analytics"]) if job["analytics"] else None
+            return job
+
+    def checkpoint(self, job_id, worker_id, stage, **fields):
+        """
+        Record that `stage` completed, storing its output `fields`, and renew the lease.
+        The "saved" checkpoint finishes the job. Raises LeaseLost if the lease was lost.
+        """
+        now = time.time()
+        values = {key: json.dumps(value) if key in ("analytics", "files") else value
+                  for key, value in fields.items()}
+        assignments = "".join(f", {key} = ?" for key in values)
+        if stage == "saved":
+            assignments += ", status = 'done', lease_owner = NULL, finished_at = ?"
+            extra = [now]
+        else:
+            assignments += ", lease_expires = ?"
+            extra = [now + self.lease_seconds]
+
+        cursor = self.db.execute(
+            f"UPDATE jobs SET stage = ?{assignments} WHERE id = ? AND lease_owner = ? AND status = 'running'",
+            [stage, *values.values(), *extra, job_id, worker_id])
+        if cursor.rowcount == 0:
+            raise LeaseLost(f"Job {job_id} is no longer leased to {worker_id}")
+
+    def fail(self, job_id, worker_id, attempts, error):
+        """
+        Requeue a failed job after a backoff delay, or mark it failed after the last
+        attempt. Returns the retry delay in seconds, or None if the job failed for good.
+        """
+        now = time.time()
+        if attempts >= self.max_attempts:
+            self.db.execute(
+                "UPDATE jobs SET status = 'failed', lease_owner = NULL, finished_at = ?, error = ?"
+                " WHERE id = ? AND lease_owner = ?",
+                (now, error, job_id, worker_id))
+            return None
+        delay = self.retry_delay * 2 ** (attempts - 1)
+        self.db.execute(
+            "UPDATE jobs SET status = 'queued', lease_owner = NULL, available_at = ?, error = ?"
+            " WHERE id = ? AND lease_owner = ?",
+            (now + delay, error, job_id, worker_id))
+        return delay
+
+    def pending(self):
+        """Number of jobs queued or running"""
+        return self.db.execute("SELECT COUNT(*) FROM jobs WHERE status IN ('queued', 'running')").fetchone()[0]
+
+    def stats(self, window=60.0):
+        """Queue depth by status and stage, and throughput over the last `window` seconds"""
+        now = time.time()
+        by_status = {status: 0 for status in ("queued", "running", "done", "failed")}
+        for row in self.db.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status"):
+            by_status[row[0]] = row[1]
+        by_stage = {row[0]: row[1] for row in self.db.execute(
+            "SELECT stage, COUNT(*) FROM jobs WHERE status IN ('queued', 'running') GROUP BY stage")}
+        recent, avg_seconds = self.db.execute(
+            "SELECT COUNT(*), AVG(finished_at - started_at) FROM jobs"
+            " WHERE status = 'done' AND finished_at >= ?", (now - window,)).fetchone()
+        return {
+            "jobs": by_status,
+            "in_progress_stages": {stage: by_stage.get(stage, 0) for stage in STAGES[:-1]},
+            "completed_in_window": recent,
+            "throughput_per_min": round(recent * 60.0 / window, 2),
+            "avg_job_seconds": round(avg_seconds, 2) if avg_seconds is not None else None,
+            "window_seconds": window,
+        }
+
+
+def process_job(queue, transcriber, job, worker_id, output_dir=".", store=None):
+    """
+    Run the remaining stages of a claimed job, checkpointing after each one.
+    With a result store, the result is appended to it and the caller records the
+    "saved" checkpoint once the store has flushed it.
+    """
+    job_id = job["id"]
+    transcript, summary, analytics = job["transcript"], job["summary"], job["analytics"]
+    stage = STAGES.index(job["stage"])
+
+    if stage < STAGES.index("transcribed"):
+        transcript = transcriber.transcribe_audio(job["audio_file"])
+        if not transcript:
+            raise RuntimeError("Transcription failed")
+        queue.checkpoint(job_id, worker_id, "transcribed", transcript=transcript)
+
+    if stage < STAGES.index("summarized"):
+        fields = {}
+        if transcriber.combined:
+            # One call yields both stages; the analytics are stored with the summary so a job
+            # resumed after "summarized" does not extract them again with a second call
+            summary, topics = transcriber.summarize_and_extract_topics(transcript)
+            if summary:
+                analytics = fields["analytics"] = transcriber.build_analytics(transcript, topics)
+        else:
+            summary = transcriber.summarize_transcript(transcript)
+        if not summary:
+            raise RuntimeError("Summary failed")
+        queue.checkpoint(job_id, worker_id, "summarized", summary=summary, **fields)
+
+    if stage < STAGES.index("analyzed"):
+        if analytics is None:
+            analytics = transcriber.extract_analytics(transcript)
+        queue.checkpoint(job_id, worker_id, "analyzed", analytics=analytics)
+
+    if store is not None:
+        digest = store.append(job["audio_file"], transcript, summary, analytics)
+        return {"store": store.path, "audio_hash": digest}
+
+    # Job ids in the file names keep workers that finish in the same second apart
+    def prefix(kind):
+        return os.path.join(output_dir, f"{kind}_job{job_id}")
+
+    files = {
+        "transcript": transcriber.save_transcription(transcript, prefix("transcription")),
+        "summary": transcriber.save_summary(summary, prefix("summary")),
+        "analytics": transcriber.save_analytics(analytics, prefix("analysis")),
+    }
+    queue.checkpoint(job_id, worker_id, "saved", files=files)
+    return files
+
+
+def run_worker(db_path, worker_id, options):
+    """Worker process loop: claim jobs until the queue is empty (with `drain`) or forever"""
+    from main import AudioTranscriber
+
+    queue = JobQueue(db_path, lease_seconds=options["lease_seconds"],
+                     max_attempts=options["max_attempts"], retry_delay=options["retry_delay"])
+    transcriber = AudioTranscriber(api_key=options.get("api_key"), combined=options.get("combined", False))
+    store = None
+    if options.get("store"):
+        from result_store import ResultStore
+        store = ResultStore(options["store"])
+    else:
+        os.makedirs(options["output_dir"], exist_ok=True)
+
+    stored = []  # (job, files) appended to the store, "saved" once flushed
+
+    def checkpoint_stored():
+        store.flush()
+        for job, files in stored:
+            try:
+                queue.checkpoint(job["id"], worker_id, "saved", files=files)
+                print(f"[{worker_id}] ✅ Job {job['id']} done")
+            except LeaseLost as e:
+                print(f"[{worker_id}] ⚠️ {e}")
+        stored.clear()
+
+    try:
+        while True:
+            job = queue.claim(worker_id)
+            # Only jobs resuming after "analyzed" finish fast enough to share a batch; before any
+            # other job (API calls, seconds each) or going idle, write and checkpoint what is buffered
+            if stored and (job is None or job["stage"] != "analyzed"):
+                checkpoint_stored()
+            if job is None:
+                if options["drain"] and queue.pending() == 0:
+                    return
+                time.sleep(options["poll_interval"])
+                continue
+
+            print(f"[{worker_id}] ▶️ Job {job['id']} (attempt {job['attempts']}, "
+                  f"resuming after '{job['stage']}'): {job['audio_file']}")
+            try:
+                files = process_job(queue, transcriber, job, worker_id, options["output_dir"], store)
+                if store is None:
+                    print(f"[{worker_id}] ✅ Job {job['id']} done")
+                else:
+                    stored.append((job, files))
+                    if store.pending == 0 or store.flush_due():
+                        checkpoint_stored()
+            except LeaseLost as e:
+                print(f"[{worker_id}] ⚠️ {e}")
+            except Exception as e:
+                delay = queue.fail(job["id"], worker_id, job["attempts"], str(e))
+                retry = f"retrying in {delay:g}s" if delay is not None else "giving up"
+                print(f"[{worker_id}] ❌ Job {job['id']} failed: {e} ({retry})")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if stored:
+            checkpoint_stored()
+        if store is not None:
+            store.close()
+        queue.close()
+
+
+def print_stats(stats):
+    """Print queue depth and throughput"""
+    jobs = stats["jobs"]
+    stages = ", ".join(f"{stage}: {count}" for stage, count in stats["in_progress_stages"].items())
+    avg = f"{stats['avg_job_seconds']:.1f}s" if stats["avg_job_seconds"] is not None else "-"
+    print(f"{time.strftime('%H:%M:%S')}  queued: {jobs['queued']}  running: {jobs['running']}  "
+          f"done: {jobs['done']}  failed: {jobs['failed']}  |  checkpoints: {stages}  |  "
+          f"{stats['throughput_per_min']:.1f} jobs/min, avg {avg} "
+          f"(last {stats['window_seconds']:.0f}s)")
+
+
+def main():
+    """Command line interface: enqueue files, run workers, watch the queue"""
+    parser = argparse.ArgumentParser(description='Durable job queue for audio processing')
+    parser.add_argument('--db', default='jobs.db', help='Queue database file (default: jobs.db)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    enqueue = commands.add_parser('enqueue', help='Add audio files to the queue')
+    enqueue.add_argument('audio_files', nargs='+', help='Audio files to process')
+
+    work = commands.add_parser('work', help='Run worker processes')
+    work.add_argument('--workers', type=int, default=2, help='Number of worker processes (default: 2)')
+    work.add_argument('--output-dir', default='.', help='Directory for result files (default: current)')
+    work.add_argument('--store', help='Append results to this result store (e.g. results.db) instead of files')
+    work.add_argument('--lease', type=float, default=600,
+                      help='Seconds a job stays leased without a checkpoint before it is retried (default: 600)')
+    work.add_argument('--max-attempts', type=int, default=3, help='Attempts per job before it fails (default: 3)')
+    work.add_argument('--retry-delay', type=float, default=5.0,
+                      help='Seconds before the first retry, doubling per attempt (default: 5)')
+    work.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls when idle')
+    work.add_argument('--drain', action='store_true', help='Exit once no jobs are queued or running')
+    work.add_argument('--combined', action='store_true',
+                      help='Get the summary and topics from one structured-output GPT call')
+    work.add_argument('--api-key', help='OpenAI API key (optional if OPENAI_API_KEY env var is set)')
+
+    status = commands.add_parser('status', help='Show queue depth and throughput')
+    status.add_argument('--watch', type=float, metavar='SECONDS', help='Refresh every SECONDS until interrupted')
+    status.add_argument('--window', type=float, default=60.0, help='Throughput window in seconds (default: 60)')
+    status.add_argument('--json', action='store_true', help='Print the statistics as JSON')
+
+    args = parser.parse_args()
+
+    if args.command == 'enqueue':
+        missing = [f for f in args.audio_files if not os.path.exists(f)]
+        if missing:
+            print(f"❌ Error: Audio file(s) not found: {', '.join(missing)}")
+            sys.exit(1)
+        queue = JobQueue(args.db)
+        ids = queue.enqueue(args.audio_files)
+        queue.close()
+        print(f"✅ Enqueued {len(ids)} job(s): {', '.join(map(str, ids))}")
+
+    elif args.command == 'work':
+        options = {
+            "lease_seconds": args.lease, "max_attempts": args.max_attempts, "retry_delay": args.retry_delay,
+            "poll_interval": args.poll_interval, "drain": args.drain, "output_dir": args.output_dir,
+            "api_key": args.api_key, "store": args.store, "combined": args.combined,
+        }
+        from main import AudioTranscriber
+        try:
+            AudioTranscriber(api_key=args.api_key)  # fail fast on a missing API key
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+            sys.exit(1)
+
+        JobQueue(args.db).close()  # create the schema before the workers race to
+        host = socket.gethostname()
+        workers = [multiprocessing.Process(target=run_worker, args=(args.db, f"{host}-{os.getpid()}-{i}", options))
+                   for i in range(args.workers)]
+        for worker in workers:
+            worker.start()
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.join()
+        print("👋 Workers stopped.")
+
+    elif args.command == 'status':
+        queue = JobQueue(args.db)
+        try:
+            while True:
+                stats = queue.stats(args.window)
+                if args.json:
+                    print(json.dumps(stats))
+                else:
+                    print_stats(stats)
+                if not args.watch:
+                    break
+                time.sleep(args.watch)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            queue.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -10,34 +10,91 @@ import json
 import re
 from datetime import datetime
 from pathlib import Path
-import openai
-from openai import OpenAI
 import argparse
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+from tracing import Tracer
+
+# Strict JSON schema for the combined summary + topics call
+TRANSCRIPT_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {
+            "type": "string",
+            "description": "Concise, well-structured summary of the transcript"
+        },
+        "topics": {
+            "type": "array",
+            "description": "The 5-10 most frequently mentioned topics",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "topic": {"type": "string"},
+                    "mentions": {"type": "integer"}
+                },
+                "required": ["topic", "mentions"],
+                "additionalProperties": False
+            }
+        }
+    },
+    "required": ["summary", "topics"],
+    "additionalProperties": False
+}
+
+
+def render_transcription(transcript_text, generated_on):
+    """Markdown document for a transcription"""
+    return (f"# Audio Transcription\n\n"
+            f"**Generated on:** {generated_on.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            f"## Transcript\n\n"
+            f"{transcript_text}")
+
+
+def render_summary(summary_text, generated_on):
+    """Markdown document for a summary"""
+    return (f"# Audio Summary\n\n"
+            f"**Generated on:** {generated_on.strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            f"## Summary\n\n"
+            f"{summary_text}")
 
 
 class AudioTranscriber:
-    def __init__(self, api_key=None):
-        """Initialize the AudioTranscriber with OpenAI API key"""
-        if api_key:
-            self.client = OpenAI(api_key=api_key)
-        else:
-            # Try to get API key from environment variable or .env file
+    def __init__(self, api_key=None, tracer=None, store=None, combined=False):
+        """
+        Initialize the AudioTranscriber with OpenAI API key and optional tracer.
+        With a ResultStore as `store`, results are appended to it instead of
+        being written to separate files. With `combined`, the summary and the
+        topics come from a single structured-output call instead of two calls.
+        """
+        self.tracer = tracer or Tracer()
+        self.store = store
+        self.combined = combined
+        if not api_key:
+            # Try to get API key from environment variable or .env file.
+            # dotenv is imported here so `--help` and bad paths stay fast.
+            from dotenv import load_dotenv
+            load_dotenv()
             api_key = os.getenv('OPENAI_API_KEY')
             if not api_key:
                 raise ValueError(
                     "OpenAI API key is required. Create a .env file with OPENAI_API_KEY=your_key or pass it as parameter.")
-            self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self._client = None
+
+    @property
+    def client(self):
+        """OpenAI client, created on first use so the SDK import is deferred"""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
 
     def transcribe_audio(self, audio_file_path):
         """Transcribe audio file using OpenAI Whisper API"""
         print(f"Transcribing audio file: {audio_file_path}")
 
         try:
-            with open(audio_file_path, "rb") as audio_file:
+            with self.tracer.span("openai.transcribe", model="whisper-1"), \
+                    open(audio_file_path, "rb") as audio_file:
                 transcript = self.client.audio.transcriptions.create(
                     model="whisper-1",
                     file=audio_file,
@@ -56,21 +113,23 @@ class AudioTranscriber:
         print("Generating summary using GPT...")
 
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that creates concise, well-structured summaries of transcribed audio content. Focus on key points, main topics, and important details."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Please provide a comprehensive summary of the following transcript:\n\n{transcript_text}"
-                    }
-                ],
-                max_tokens=500,
-                temperature=0.3
-            )
+            with self.tracer.span("openai.summarize", model="gpt-4.1-mini") as span:
+                response = self.client.chat.completions.create(
+                    model="gpt-4.1-mini",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a helpful assistant that creates concise, well-structured summaries of transcribed audio content. Focus on key points, main topics, and important details."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Please provide a comprehensive summary of the following transcript:\n\n{transcript_text}"
+                        }
+                    ],
+                    max_tokens=500,
+                    temperature=0.3
+                )
+                span.record_usage(response)
 
             summary = response.choices[0].message.content
             print("✅ Summary generated successfully!")
@@ -80,31 +139,78 @@ class AudioTranscriber:
             print(f"❌ Error generating summary: {str(e)}")
             return None
 
+    def summarize_and_extract_topics(self, transcript_text):
+        """
+        Generate the summary and the topic list with one GPT call. The transcript is
+        sent once and the reply is constrained to TRANSCRIPT_ANALYSIS_SCHEMA, so it
+        always parses. Returns (summary, topics), or (None, None) on failure.
+        """
+        print("Generating summary and topics using GPT (single call)...")
+
+        try:
+            with self.tracer.span("openai.summarize_topics", model="gpt-4.1-mini") as span:
+                response = self.client.chat.completions.create(
+                    model="gpt-4.1-mini",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are a helpful assistant that analyzes transcribed audio content. Write a concise, well-structured summary focusing on key points, main topics, and important details, and identify the most frequently mentioned topics with their mention counts."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Please summarize the following transcript and identify its top 5-10 most frequently mentioned topics with their mention counts:\n\n{transcript_text}"
+                        }
+                    ],
+                    response_format={
+                        "type": "json_schema",
+                        "json_schema": {
+                            "name": "transcript_analysis",
+                            "strict": True,
+                            "schema": TRANSCRIPT_ANALYSIS_SCHEMA
+                        }
+                    },
+                    max_tokens=800,
+                    temperature=0.3
+                )
+                span.record_usage(response)
+
+            message = response.choices[0].message
+            if getattr(message, "refusal", None):
+                raise ValueError(f"request refused: {message.refusal}")
+            if response.choices[0].finish_reason == "length":
+                raise ValueError("response truncated at max_tokens")
+            result = json.loads(message.content)
+
+            print("✅ Summary and topics generated successfully!")
+            return result["summary"], result["topics"]
+
+        except Exception as e:
+            print(f"❌ Error generating summary and topics: {str(e)}")
+            return None, None
+
     def extract_analytics(self, transcript_text):
         """Extract analytics from the transcript"""
         print("Extracting analytics from transcript...")
 
-        # Calculate word count
-        words = transcript_text.split()
-        word_count = len(words)
-
         # Extract topics using GPT
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert at analyzing text and identifying the most frequently mentioned topics. Return only a JSON array of objects with 'topic' and 'mentions' fields, focusing on the most significant topics mentioned multiple times."
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Analyze this transcript and identify the top 5-10 most frequently mentioned topics with their mention counts. Return only valid JSON:\n\n{transcript_text}"
-                    }
-                ],
-                max_tokens=300,
-                temperature=0.1
-            )
+            with self.tracer.span("openai.topics", model="gpt-4.1-mini") as span:
+                response = self.client.chat.completions.create(
+                    model="gpt-4.1-mini",
+                    messages=[
+                        {
+                            "role": "system",
+                            "content": "You are an expert at analyzing text and identifying the most frequently mentioned topics. Return only a JSON array of objects with 'topic' and 'mentions' fields, focusing on the most significant topics mentioned multiple times."
+                        },
+                        {
+                            "role": "user",
+                            "content": f"Analyze this transcript and identify the top 5-10 most frequently mentioned topics with their mention counts. Return only valid JSON:\n\n{transcript_text}"
+                        }
+                    ],
+                    max_tokens=300,
+                    temperature=0.1
+                )
+                span.record_usage(response)
 
             topics_text = response.choices[0].message.content
             # Try to extract JSON from the response
@@ -123,32 +229,37 @@ class AudioTranscriber:
                 f"⚠️ Warning: Could not extract topics automatically: {str(e)}")
             topics = []
 
+        analytics = self.build_analytics(transcript_text, topics)
+
+        print("✅ Analytics extracted successfully!")
+        return analytics
+
+    def build_analytics(self, transcript_text, topics):
+        """Analytics dict from the transcript and an already extracted topic list"""
+        # Calculate word count
+        words = transcript_text.split()
+        word_count = len(words)
+
         # Estimate speaking speed (assuming average audio length)
         # This is a rough estimation - in a real app, you'd want the actual audio duration
         estimated_duration_minutes = word_count / 150  # Average speaking speed
         speaking_speed_wpm = round(
             word_count / estimated_duration_minutes) if estimated_duration_minutes > 0 else 0
 
-        analytics = {
+        return {
             "word_count": word_count,
             "speaking_speed_wpm": speaking_speed_wpm,
             "frequently_mentioned_topics": topics
         }
 
-        print("✅ Analytics extracted successfully!")
-        return analytics
-
     def save_transcription(self, transcript_text, filename_prefix="transcription"):
         """Save transcription to a separate file"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{filename_prefix}_{timestamp}.md"
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Audio Transcription\n\n")
-            f.write(
-                f"**Generated on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(f"## Transcript\n\n")
-            f.write(transcript_text)
+        with self.tracer.span("file.save_transcription"), \
+                open(filename, 'w', encoding='utf-8') as f:
+            f.write(render_transcription(transcript_text, datetime.now()))
 
         print(f"✅ Transcription saved to: {filename}")
         return filename
@@ -158,12 +269,9 @@ class AudioTranscriber:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{filename_prefix}_{timestamp}.md"
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(f"# Audio Summary\n\n")
-            f.write(
-                f"**Generated on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(f"## Summary\n\n")
-            f.write(summary_text)
+        with self.tracer.span("file.save_summary"), \
+                open(filename, 'w', encoding='utf-8') as f:
+            f.write(render_summary(summary_text, datetime.now()))
 
         print(f"✅ Summary saved to: {filename}")
         return filename
@@ -173,7 +281,8 @@ class AudioTranscriber:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"{filename_prefix}_{timestamp}.json"
 
-        with open(filename, 'w', encoding='utf-8') as f:
+        with self.tracer.span("file.save_analytics"), \
+                open(filename, 'w', encoding='utf-8') as f:
             json.dump(analytics_data, f, indent=2)
 
         print(f"✅ Analytics saved to: {filename}")
@@ -181,6 +290,10 @@ class AudioTranscriber:
 
     def process_audio_file(self, audio_file_path):
         """Complete workflow: transcribe, summarize, analyze, and save"""
+        with self.tracer.span("pipeline.process_audio_file", audio_file=str(audio_file_path)):
+            return self._process_audio_file(audio_file_path)
+
+    def _process_audio_file(self, audio_file_path):
         print(f"\n🎵 Starting audio processing workflow for: {audio_file_path}")
         print("=" * 60)
 
@@ -189,18 +302,32 @@ class AudioTranscriber:
         if not transcript:
             return None
 
-        # Step 2: Generate summary
-        summary = self.summarize_transcript(transcript)
-        if not summary:
-            return None
+        if self.combined:
+            # Steps 2-3: Summary and topics from a single structured-output call
+            summary, topics = self.summarize_and_extract_topics(transcript)
+            if not summary:
+                return None
+            analytics = self.build_analytics(transcript, topics)
+        else:
+            # Step 2: Generate summary
+            summary = self.summarize_transcript(transcript)
+            if not summary:
+                return None
 
-        # Step 3: Extract analytics
-        analytics = self.extract_analytics(transcript)
+            # Step 3: Extract analytics
+            analytics = self.extract_analytics(transcript)
 
         # Step 4: Save all results
-        transcript_file = self.save_transcription(transcript)
-        summary_file = self.save_summary(summary)
-        analytics_file = self.save_analytics(analytics)
+        if self.store is not None:
+            with self.tracer.span("store.append"):
+                digest = self.store.append(audio_file_path, transcript, summary, analytics)
+            files = {'store': self.store.path, 'audio_hash': digest}
+        else:
+            files = {
+                'transcript': self.save_transcription(transcript),
+                'summary': self.save_summary(summary),
+                'analytics': self.save_analytics(analytics)
+            }
 
         # Step 5: Display results in console
         print("\n" + "=" * 60)
@@ -218,21 +345,25 @@ class AudioTranscriber:
         for topic in analytics['frequently_mentioned_topics'][:5]:
             print(f"  • {topic['topic']}: {topic['mentions']} mentions")
 
-        print(f"\n💾 FILES CREATED:")
-        print("-" * 40)
-        print(f"  • Transcription: {transcript_file}")
-        print(f"  • Summary: {summary_file}")
-        print(f"  • Analytics: {analytics_file}")
+        if self.store is not None:
+            print(f"\n💾 RESULT STORED:")
+            print("-" * 40)
+            print(f"  • Store: {files['store']}")
+            print(f"  • Audio hash: {files['audio_hash']}")
+            print(f"  • Export files with: python result_store.py --store {files['store']} "
+                  f"export {files['audio_hash'][:12]}")
+        else:
+            print(f"\n💾 FILES CREATED:")
+            print("-" * 40)
+            print(f"  • Transcription: {files['transcript']}")
+            print(f"  • Summary: {files['summary']}")
+            print(f"  • Analytics: {files['analytics']}")
 
         return {
             'transcript': transcript,
             'summary': summary,
             'analytics': analytics,
-            'files': {
-                'transcript': transcript_file,
-                'summary': summary_file,
-                'analytics': analytics_file
-            }
+            'files': files
         }
 
 
@@ -244,6 +375,15 @@ def main():
         'audio_file', help='Path to the audio file to transcribe')
     parser.add_argument(
         '--api-key', help='OpenAI API key (optional if OPENAI_API_KEY env var is set)')
+    parser.add_argument(
+        '--store', help='Append the result to this result store (e.g. results.db) instead of writing separate files')
+    parser.add_argument(
+        '--combined', action='store_true',
+        help='Get the summary and topics from one structured-output GPT call (transcript sent once)')
+    parser.add_argument(
+        '--profile', action='store_true', help='Print a per-stage timing breakdown')
+    parser.add_argument(
+        '--trace', help='Export a trace to this file (.jsonl for JSONL, otherwise Chrome trace format)')
 
     args = parser.parse_args()
 
@@ -252,12 +392,26 @@ def main():
         print(f"❌ Error: Audio file '{args.audio_file}' not found.")
         sys.exit(1)
 
+    store = None
     try:
         # Initialize transcriber
-        transcriber = AudioTranscriber(api_key=args.api_key)
+        tracer = Tracer(enabled=args.profile or bool(args.trace))
+        if args.store:
+            from result_store import ResultStore
+            store = ResultStore(args.store)
+        transcriber = AudioTranscriber(api_key=args.api_key, tracer=tracer, store=store,
+                                      combined=args.combined)
 
         # Process the audio file
         result = transcriber.process_audio_file(args.audio_file)
+        if store is not None:
+            with tracer.span("store.flush"):
+                store.flush()
+
+        if args.profile:
+            tracer.print_profile()
+        if args.trace:
+            print(f"Trace saved to: {tracer.export(args.trace)}")
 
         if result:
             print(f"\n🎉 Audio processing completed successfully!")
@@ -268,6 +422,9 @@ def main():
     except Exception as e:
         print(f"❌ Error: {str(e)}")
         sys.exit(1)
+    finally:
+        if store is not None:
+            store.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Consolidated Output Store for Audio Results
+Append-only SQLite store holding one record (transcript, summary, analytics)
+per processed audio file, keyed by the SHA-256 hash of the audio content,
+with an exporter that writes the usual markdown/JSON files on demand
+"""
+
+import os
+import sys
+import json
+import time
+import hashlib
+import sqlite3
+import argparse
+from datetime import datetime
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    audio_hash TEXT NOT NULL,
+    audio_file TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    transcript TEXT NOT NULL,
+    summary TEXT,
+    analytics TEXT
+);
+CREATE INDEX IF NOT EXISTS results_audio_hash ON results (audio_hash, id);
+CREATE TRIGGER IF NOT EXISTS results_no_update BEFORE UPDATE ON results
+BEGIN SELECT RAISE(ABORT, 'results are append-only'); END;
+CREATE TRIGGER IF NOT EXISTS results_no_delete BEFORE DELETE ON results
+BEGIN SELECT RAISE(ABORT, 'results are append-only'); END;
+"""
+
+
+def audio_hash(audio_file_path, chunk_size=1 << 20):
+    """SHA-256 hex digest of an audio file's content"""
+    digest = hashlib.sha256()
+    with open(audio_file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultStore:
+    def __init__(self, path="results.db", batch_size=32, flush_interval=1.0):
+        """
+        Open (or create) the store at `path`. Appended records are buffered and
+        written in one transaction (one fsync) once `batch_size` records are
+        waiting or the oldest has waited `flush_interval` seconds; call `flush()`
+        or `close()` to write the rest. Several processes may append at once.
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._buffered_since = None
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=FULL")  # every commit is fsynced
+        self.db.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def close(self):
+        """Write buffered records and close the database"""
+        self.flush()
+        self.db.close()
+
+    @property
+    def pending(self):
+        """Number of appended records not yet written"""
+        return len(self._buffer)
+
+    def append(self, audio_file, transcript, summary, analytics, audio_digest=None):
+        """
+        Buffer one result record; returns the audio hash it is stored under.
+        The record is durable after the next flush.
+        """
+        digest = audio_digest or audio_hash(audio_file)
+        self._buffer.append((digest, os.path.abspath(audio_file), time.time(), transcript, summary,
+                             json.dumps(analytics) if analytics is not None else None))
+        if self._buffered_since is None:
+            self._buffered_since = time.monotonic()
+        if self.flush_due():
+            self.flush()
+        return digest
+
+    def flush_due(self):
+        """Whether the buffer is full or its oldest record has waited `flush_interval`"""
+        return bool(self._buffer) and (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._buffered_since >= self.flush_interval)
+
+    def flush(self):
+        """Write all buffered records in one transaction; returns the number written"""
+        if not self._buffer:
+            return 0
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            self.db.executemany(
+                "INSERT INTO results (audio_hash, audio_file, created_at, transcript, summary, analytics)"
+                " VALUES (?, ?, ?, ?, ?, ?)", self._buffer)
+            self.db.execute("COMMIT")
+        except BaseException:
+            self.db.execute("ROLLBACK")
+            raise
+        written = len(self._buffer)
+        self._buffer = []
+        self._buffered_since = None
+        return written
+
+    def _record(self, row):
+        record = dict(row)
+        record["analytics"] = json.loads(record["analytics"]) if record["analytics"] else None
+        return record
+
+    def latest(self, digest):
+        """Newest record for an audio hash (a unique prefix is enough), or None"""
+        # Hex digits sort below "g", so this range holds exactly the hashes with the prefix
+        matches = self.db.execute(
+            "SELECT DISTINCT audio_hash FROM results WHERE audio_hash >= ? AND audio_hash < ? LIMIT 2",
+            (digest, digest + "g")).fetchall()
+        if len(matches) != 1:
+            return None
+        row = self.db.execute("SELECT * FROM results WHERE audio_hash = ? ORDER BY id DESC LIMIT 1",
+                              (matches[0][0],)).fetchone()
+        return self._record(row)
+
+    def history(self, digest):
+        """All records for a full audio hash, oldest first"""
+        return [self._record(row) for row in
+                self.db.execute("SELECT * FROM results WHERE audio_hash = ? ORDER BY id", (digest,))]
+
+    def entries(self):
+        """(audio_hash, audio_file, runs, last created_at) for every stored audio file"""
+        return [tuple(row) for row in self.db.execute(
+            "SELECT audio_hash, audio_file, COUNT(*), MAX(created_at) FROM results"
+            " GROUP BY audio_hash ORDER BY MAX(id)")]
+
+    def export(self, record, output_dir="."):
+        """Write a record as the transcription/summary markdown and analytics JSON files"""
+        from main import render_transcription, render_summary
+
+        os.makedirs(output_dir, exist_ok=True)
+        generated_on = datetime.fromtimestamp(record["created_at"])
+        suffix = f"{record['audio_hash'][:12]}_{generated_on.strftime('%Y%m%d_%H%M%S')}"
+        files = {
+            "transcript": os.path.join(output_dir, f"transcription_{suffix}.md"),
+            "summary": os.path.join(output_dir, f"summary_{suffix}.md"),
+            "analytics": os.path.join(output_dir, f"analysis_{suffix}.json"),
+        }
+        with open(files["transcript"], 'w', encoding='utf-8') as f:
+            f.write(render_transcription(record["transcript"], generated_on))
+        with open(files["summary"], 'w', encoding='utf-8') as f:
+            f.write(render_summary(record["summary"] or "", generated_on))
+        with open(files["analytics"], 'w', encoding='utf-8') as f:
+            json.dump(record["analytics"] or {}, f, indent=2)
+        return files
+
+
+def main():
+    """Command line interface: list stored results and export them as files"""
+    parser = argparse.ArgumentParser(description='Consolidated output store for audio results')
+    parser.add_argument('--store', default='results.db', help='Store database file (default: results.db)')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('list', help='List stored audio files')
+
+    export = commands.add_parser('export', help='Write the markdown/JSON files for stored results')
+    export.add_argument('keys', nargs='*',
+                        help='Audio files or audio hashes (or unique hash prefixes); default: all')
+    export.add_argument('--output-dir', default='.', help='Directory for the files (default: current)')
+
+    args = parser.parse_args()
+
+    if not os.path.exists(args.store):
+        print(f"❌ Error: Store '{args.store}' not found.")
+        sys.exit(1)
+
+    with ResultStore(args.store) as store:
+        if args.command == 'list':
+            for digest, audio_file, runs, created_at in store.entries():
+                stamp = datetime.fromtimestamp(created_at).strftime('%Y-%m-%d %H:%M:%S')
+                print(f"{digest[:12]}  {stamp}  {runs:>3} run(s)  {audio_file}")
+
+        elif args.command == 'export':
+            keys = args.keys or [digest for digest, *_ in store.entries()]
+            failed = False
+            for key in keys:
+                record = store.latest(audio_hash(key) if os.path.isfile(key) else key)
+                if record is None:
+                    print(f"❌ No stored result for: {key}")
+                    failed = True
+                    continue
+                files = store.export(record, args.output_dir)
+                print(f"✅ {record['audio_hash'][:12]} ({os.path.basename(record['audio_file'])}): "
+                      f"{', '.join(files.values())}")
+            if failed:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
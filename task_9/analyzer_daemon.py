@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Service Analyzer Daemon
+
+Long-running process that keeps one ServiceAnalyzer (and with it the OpenAI
+client and its pool of keep-alive connections) warm and serves analysis
+requests over HTTP on localhost. Requests beyond the concurrency limit wait
+in a bounded queue, identical concurrent requests share one API call, and
+finished reports are cached in memory.
+
+service_analyzer.py uses a running daemon automatically (see
+daemon_client.py), so each invocation skips the expensive part of a cold
+start: dotenv/openai imports, client creation and the TLS handshake.
+"""
+
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import argparse
+import ipaddress
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from tracing import Tracer
+from daemon_client import DaemonClient, ADDRESS_VARIABLE, DEFAULT_ADDRESS, parse_address
+
+
+class QueueFull(Exception):
+    """Raised when the request queue is at its limit."""
+
+
+def cache_key(service_input):
+    """Requests differing only in case and whitespace get the same report."""
+    return " ".join(service_input.split()).casefold()
+
+
+class ReportCache:
+    def __init__(self, max_entries=128, ttl=3600.0):
+        """LRU cache of at most `max_entries` reports, each kept for `ttl` seconds."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        """Cached report for `key`, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, report):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic(), report)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+class AnalyzerDaemon:
+    def __init__(self, analyzer, max_concurrency=4, max_queue=64, cache_size=128, cache_ttl=3600.0):
+        """
+        Serve `analyzer` with at most `max_concurrency` API calls at a time and at
+        most `max_queue` requests waiting for a slot; further requests are rejected.
+        """
+        self.analyzer = analyzer
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.cache = ReportCache(cache_size, cache_ttl)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._inflight = {}  # cache key -> Future of the running request
+        self.started = time.time()
+        self.waiting = 0
+        self.active = 0
+        self.counters = {"requests": 0, "completed": 0, "failed": 0, "coalesced": 0, "rejected": 0}
+
+    def _count(self, name):
+        with self._lock:
+            self.counters[name] += 1
+
+    def analyze(self, service_input, refresh=False):
+        """
+        Report for `service_input` as a dict with `report` (None on failure),
+        `cached`, `queue_ms` and `analysis_ms`. With `refresh`, the cache is skipped
+        (and updated). Raises QueueFull when too many requests are waiting.
+        """
+        self._count("requests")
+        key = cache_key(service_input)
+        if not refresh:
+            report = self.cache.get(key)
+            if report is not None:
+                return {"report": report, "cached": True, "queue_ms": 0.0, "analysis_ms": 0.0}
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            # The same service is being analyzed right now; share its result
+            self._count("coalesced")
+            return future.result()
+
+        try:
+            queued = time.perf_counter()
+            if not self._slots.acquire(blocking=False):
+                # No free slot: wait in the queue, if it has room
+                with self._lock:
+                    if self.waiting >= self.max_queue:
+                        self.counters["rejected"] += 1
+                        raise QueueFull(f"{self.waiting} requests already waiting")
+                    self.waiting += 1
+                try:
+                    self._slots.acquire()
+                finally:
+                    with self._lock:
+                        self.waiting -= 1
+            started = time.perf_counter()
+            with self._lock:
+                self.active += 1
+            try:
+                report = self.analyzer.analyze_service(service_input)
+            finally:
+                with self._lock:
+                    self.active -= 1
+                self._slots.release()
+            result = {
+                "report": report,
+                "cached": False,
+                "queue_ms": round((started - queued) * 1000, 3),
+                "analysis_ms": round((time.perf_counter() - started) * 1000, 3),
+            }
+            if report:
+                self.cache.put(key, report)
+            self._count("completed" if report else "failed")
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stats(self):
+        """Queue depth, request counters and cache statistics."""
+        with self._lock:
+            stats = {
+                "service": "service_analyzer",
+                "pid": os.getpid(),
+                "uptime_s": round(time.time() - self.started, 1),
+                "max_concurrency": self.max_concurrency,
+                "max_queue": self.max_queue,
+                "active": self.active,
+                "waiting": self.waiting,
+            }
+            stats.update(self.counters)
+        stats["cache"] = self.cache.stats()
+        return stats
+
+
+class DaemonHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls on each response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self.send_json(200, self.server.analyzer_daemon.stats())
+        else:
+            self.send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self.send_json(400, {"error": "Request body must be JSON"})
+            return
+
+        if self.path == "/analyze":
+            service_input = str(request.get("service") or "").strip()
+            if not service_input:
+                self.send_json(400, {"error": "No service provided"})
+                return
+            try:
+                result = self.server.analyzer_daemon.analyze(service_input, refresh=bool(request.get("refresh")))
+            except QueueFull as e:
+                self.send_json(503, {"error": f"Daemon busy: {e}"})
+                return
+            if result["report"] is None:
+                self.send_json(502, dict(result, error="Analysis failed (see the daemon log)"))
+            else:
+                self.send_json(200, result)
+        elif self.path == "/shutdown":
+            self.send_json(200, {"stopping": True})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        else:
+            self.send_json(404, {"error": f"Unknown endpoint {self.path}"})
+
+
+class DaemonServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, daemon):
+        super().__init__(address, DaemonHandler)
+        self.analyzer_daemon = daemon
+
+
+def is_loopback(host):
+    """Whether every address `host` resolves to is a loopback address."""
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, None)}
+    except (socket.gaierror, UnicodeError):
+        return False
+    return all(ipaddress.ip_address(address.split("%")[0]).is_loopback for address in addresses)
+
+
+def serve(args):
+    """Run the daemon in the foreground until interrupted or stopped."""
+    try:
+        address = parse_address(args.address)
+    except ValueError:
+        print(f"Error: invalid address {args.address!r}; expected host:port")
+        sys.exit(1)
+    # No authentication: whoever can reach the daemon spends its API key
+    if not args.allow_remote and not is_loopback(address[0]):
+        print(f"Error: {address[0]} is not a loopback address. The daemon has no authentication, so anyone "
+              "who can reach it can make API calls billed to your key; pass --allow-remote to listen there anyway.")
+        sys.exit(1)
+
+    from service_analyzer import ServiceAnalyzer
+
+    tracer = Tracer(enabled=args.profile or bool(args.trace))
+    analyzer = ServiceAnalyzer(tracer=tracer)
+    analyzer.client  # import the SDK and create the shared client now, not on the first request
+
+    daemon = AnalyzerDaemon(analyzer, max_concurrency=args.max_concurrency, max_queue=args.max_queue,
+                            cache_size=args.cache_size, cache_ttl=args.cache_ttl)
+    try:
+        server = DaemonServer(address, daemon)
+    except OSError as e:
+        print(f"Error: cannot listen on {args.address}: {e}")
+        sys.exit(1)
+
+    # SIGTERM stops the daemon the same way as Ctrl+C
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"Service analyzer daemon listening on {args.address} (pid {os.getpid()})")
+    print(f"Concurrency {args.max_concurrency}, queue {args.max_queue}, "
+          f"cache {args.cache_size} reports for {args.cache_ttl:g}s")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("Daemon stopped.")
+
+    if args.profile:
+        tracer.print_profile()
+    if args.trace:
+        print(f"Trace saved to: {tracer.export(args.trace)}")
+
+
+def main():
+    """Command line interface: serve, status and stop."""
+    parser = argparse.ArgumentParser(description="Warm daemon serving service analysis requests on localhost")
+    parser.add_argument('--address', default=os.getenv(ADDRESS_VARIABLE) or DEFAULT_ADDRESS,
+                        help=f'host:port of the daemon (default: ${ADDRESS_VARIABLE} or {DEFAULT_ADDRESS})')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = commands.add_parser('serve', help='Run the daemon in the foreground')
+    serve_parser.add_argument('--max-concurrency', type=int, default=4,
+                              help='API calls running at the same time (default: 4)')
+    serve_parser.add_argument('--max-queue', type=int, default=64,
+                              help='Requests waiting for a slot before new ones are rejected (default: 64)')
+    serve_parser.add_argument('--cache-size', type=int, default=128,
+                              help='Reports kept in memory; 0 disables the cache (default: 128)')
+    serve_parser.add_argument('--cache-ttl', type=float, default=3600.0,
+                              help='Seconds a cached report is served (default: 3600)')
+    serve_parser.add_argument('--allow-remote', action='store_true',
+                              help='Allow listening on a non-loopback address (there is no authentication)')
+    serve_parser.add_argument('--profile', action='store_true', help='Print a per-stage timing breakdown on exit')
+    serve_parser.add_argument('--trace', help='Export a trace to this file on exit')
+
+    status_parser = commands.add_parser('status', help='Show queue depth, counters and cache statistics')
+    status_parser.add_argument('--json', action='store_true', help='Print the statistics as JSON')
+
+    commands.add_parser('stop', help='Stop a running daemon')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args)
+        return
+
+    client = DaemonClient.connect(args.address)
+    if client is None:
+        print(f"No daemon running at {args.address}.")
+        sys.exit(1)
+
+    if args.command == 'status':
+        stats = client.stats()
+        if args.json:
+            print(json.dumps(stats, indent=2))
+        else:
+            cache = stats["cache"]
+            print(f"Daemon at {args.address} (pid {stats['pid']}, up {stats['uptime_s']:g}s)")
+            print(f"  Active: {stats['active']}/{stats['max_concurrency']}   "
+                  f"Waiting: {stats['waiting']}/{stats['max_queue']}")
+            print(f"  Requests: {stats['requests']}   Completed: {stats['completed']}   "
+                  f"Failed: {stats['failed']}   Coalesced: {stats['coalesced']}   Rejected: {stats['rejected']}")
+            print(f"  Cache: {cache['entries']} reports, {cache['hits']} hits, {cache['misses']} misses")
+
+    elif args.command == 'stop':
+        client.shutdown()
+        print(f"Daemon at {args.address} stopping.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Analyzer Daemon Client
+
+Thin client for analyzer_daemon.py, used by service_analyzer.py when a
+daemon is running. It only needs the standard library's http.client, so
+an invocation served by the daemon never imports dotenv or openai.
+"""
+
+import os
+import json
+import http.client
+
+from tracing import Tracer
+
+DEFAULT_ADDRESS = "127.0.0.1:8787"
+
+# Environment variable overriding the daemon address used by service_analyzer.py
+ADDRESS_VARIABLE = "SERVICE_ANALYZER_DAEMON"
+
+# Seconds the client waits for a connection before treating the daemon as not running
+PROBE_TIMEOUT = 0.5
+
+
+def parse_address(address):
+    """Split "host:port" into (host, port)."""
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class DaemonClient:
+    def __init__(self, address=DEFAULT_ADDRESS, tracer=None, timeout=600.0):
+        """Client for the daemon at `address` ("host:port")."""
+        self.address = address
+        self.host, self.port = parse_address(address)
+        self.tracer = tracer or Tracer()
+        self.timeout = timeout
+
+    @classmethod
+    def connect(cls, address=None, tracer=None):
+        """Client for the daemon at `address` (default: $SERVICE_ANALYZER_DAEMON), or None if none is running."""
+        try:
+            client = cls(address or os.getenv(ADDRESS_VARIABLE) or DEFAULT_ADDRESS, tracer)
+            with client.tracer.span("daemon.probe"):
+                status, health = client._request("GET", "/health", timeout=PROBE_TIMEOUT)
+        except (OSError, ValueError):  # also a malformed address or a non-JSON answer
+            return None
+        if status != 200 or not isinstance(health, dict) or health.get("service") != "service_analyzer":
+            return None
+        return client
+
+    def _request(self, method, path, payload=None, timeout=None):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=timeout or self.timeout)
+        try:
+            body = json.dumps(payload) if payload is not None else None
+            connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+            response = connection.getresponse()
+            return response.status, json.loads(response.read() or b"{}")
+        finally:
+            connection.close()
+
+    def analyze_service(self, service_input, refresh=False):
+        """Analyze the service through the daemon; same contract as ServiceAnalyzer.analyze_service."""
+        try:
+            print(f"Analyzing: {service_input}")
+            print(f"Generating comprehensive report using the analyzer daemon at {self.address}...")
+
+            with self.tracer.span("daemon.analyze") as span:
+                status, result = self._request("POST", "/analyze", {"service": service_input, "refresh": refresh})
+                span.set(status=status, cached=result.get("cached"), queue_ms=result.get("queue_ms"),
+                         analysis_ms=result.get("analysis_ms"))
+            if status != 200:
+                raise RuntimeError(result.get("error", f"HTTP {status}"))
+            if result["cached"]:
+                print("(served from the daemon's report cache)")
+            return result["report"]
+
+        except Exception as e:
+            print(f"Error analyzing service: {str(e)}")
+            return None
+
+    def stats(self):
+        return self._request("GET", "/health", timeout=PROBE_TIMEOUT)[1]
+
+    def shutdown(self):
+        self._request("POST", "/shutdown", {}, timeout=PROBE_TIMEOUT)
@@ -9,22 +9,35 @@ and returns a comprehensive, markdown-formatted report from multiple viewpoints.
 import os
 import sys
 import argparse
-from openai import OpenAI
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+from tracing import Tracer
 
 class ServiceAnalyzer:
-    def __init__(self):
-        """Initialize the ServiceAnalyzer with OpenAI client."""
+    def __init__(self, tracer=None):
+        """Initialize the ServiceAnalyzer and validate the OpenAI API key."""
+        self.tracer = tracer or Tracer()
+        
+        # Environment loading is deferred to here so that `--help` and argument
+        # errors never pay for importing dotenv/openai.
+        from dotenv import load_dotenv
+        load_dotenv()
+        
         api_key = os.getenv('OPENAI_API_KEY')
         if not api_key:
             print("Error: OpenAI API key not found. Please set OPENAI_API_KEY environment variable.")
             print("You can set it in a .env file or as an environment variable.")
             sys.exit(1)
         
-        self.client = OpenAI(api_key=api_key)
+        self.api_key = api_key
+        self._client = None
+    
+    @property
+    def client(self):
+        """OpenAI client, created on first use (the SDK import is slow)."""
+        if self._client is None:
+            from openai import OpenAI
+            self._client = OpenAI(api_key=self.api_key)
+        return self._client
     
     def get_analysis_prompt(self, service_input):
         """Generate the prompt for OpenAI to analyze the service."""
@@ -72,15 +85,17 @@ Please ensure each section is detailed and informative, drawing from your knowle
             
             prompt = self.get_analysis_prompt(service_input)
             
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert business and technology analyst with deep knowledge of various services and products across different industries."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=2000,
-                temperature=0.7
-            )
+            with self.tracer.span("openai.chat", model="gpt-4.1-mini") as span:
+                response = self.client.chat.completions.create(
+                    model="gpt-4.1-mini",
+                    messages=[
+                        {"role": "system", "content": "You are an expert business and technology analyst with deep knowledge of various services and products across different industries."},
+                        {"role": "user", "content": prompt}
+                    ],
+                    max_tokens=2000,
+                    temperature=0.7
+                )
+                span.record_usage(response)
             
             return response.choices[0].message.content
             
@@ -90,18 +105,23 @@ Please ensure each section is detailed and informative, drawing from your knowle
     
     def save_report(self, report, filename=None):
         """Save the report to a file."""
-        if not filename:
-            timestamp = __import__('datetime').datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"service_analysis_{timestamp}.md"
-        
-        try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                f.write(report)
-            print(f"Report saved to: {filename}")
-            return filename
-        except Exception as e:
-            print(f"Error saving report: {str(e)}")
-            return None
+        return save_report(report, filename, self.tracer)
+
+def save_report(report, filename=None, tracer=None):
+    """Save the report to a file (needs no API key, so daemon clients use it too)."""
+    tracer = tracer or Tracer()
+    if not filename:
+        timestamp = __import__('datetime').datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"service_analysis_{timestamp}.md"
+    
+    try:
+        with tracer.span("file.save_report"), open(filename, 'w', encoding='utf-8') as f:
+            f.write(report)
+        print(f"Report saved to: {filename}")
+        return filename
+    except Exception as e:
+        print(f"Error saving report: {str(e)}")
+        return None
 
 def main():
     """Main function to run the console application."""
@@ -113,6 +133,7 @@ Examples:
   python service_analyzer.py "Spotify"
   python service_analyzer.py "Netflix streaming platform"
   python service_analyzer.py --interactive
+  python analyzer_daemon.py serve        # keep a warm daemon; later calls use it
         """
     )
     
@@ -133,10 +154,45 @@ Examples:
         help='Output filename for the report'
     )
     
+    parser.add_argument(
+        '--daemon',
+        metavar='HOST:PORT',
+        help='Address of the analyzer daemon (default: $SERVICE_ANALYZER_DAEMON or 127.0.0.1:8787)'
+    )
+    
+    parser.add_argument(
+        '--no-daemon',
+        action='store_true',
+        help='Call the API from this process even if a daemon is running'
+    )
+    
+    parser.add_argument(
+        '--refresh',
+        action='store_true',
+        help="Bypass the daemon's report cache"
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Print a per-stage timing breakdown'
+    )
+    
+    parser.add_argument(
+        '--trace',
+        help='Export a trace to this file (.jsonl for JSONL, otherwise Chrome trace format)'
+    )
+    
     args = parser.parse_args()
     
-    # Initialize analyzer
-    analyzer = ServiceAnalyzer()
+    # Initialize analyzer: a thin client when a daemon is running, otherwise a local one
+    tracer = Tracer(enabled=args.profile or bool(args.trace))
+    client = analyzer = None
+    if not args.no_daemon:
+        from daemon_client import DaemonClient
+        client = DaemonClient.connect(args.daemon, tracer=tracer)
+    if client is None:
+        analyzer = ServiceAnalyzer(tracer=tracer)
     
     # Get service input
     if args.interactive or not args.service:
@@ -152,7 +208,10 @@ Examples:
         service_input = args.service
     
     # Analyze the service
-    report = analyzer.analyze_service(service_input)
+    if client is not None:
+        report = client.analyze_service(service_input, refresh=args.refresh)
+    else:
+        report = analyzer.analyze_service(service_input)
     
     if report:
         print("\n" + "="*80)
@@ -166,11 +225,17 @@ Examples:
             save_choice = input("\nWould you like to save this report to a file? (y/n): ").strip().lower()
             if save_choice in ['y', 'yes']:
                 filename = input("Enter filename (or press Enter for auto-generated): ").strip()
-                analyzer.save_report(report, filename if filename else None)
+                save_report(report, filename if filename else None, tracer)
         else:
             # Save automatically when not in interactive mode
-            analyzer.save_report(report, args.output)
-    else:
+            save_report(report, args.output, tracer)
+    
+    if args.profile:
+        tracer.print_profile()
+    if args.trace:
+        print(f"Trace saved to: {tracer.export(args.trace)}")
+    
+    if not report:
         print("Failed to generate analysis report.")
         sys.exit(1)
 
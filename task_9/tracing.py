@@ -0,0 +1,165 @@
+"""
+Lightweight tracing
+
+Records timed spans (API calls, file writes, filter stages, ...) with
+optional attributes such as token usage. When the tracer is disabled,
+`span()` returns a shared no-op object, so instrumented code costs only a
+method call.
+
+Traces can be exported as JSONL (one span per line) or in Chrome trace
+format (open in chrome://tracing or https://ui.perfetto.dev).
+"""
+
+import os
+import json
+import time
+import threading
+
+
+class Span:
+    """A single timed operation."""
+
+    __slots__ = ("name", "start", "end", "attributes", "thread_id", "_tracer")
+
+    def __init__(self, tracer, name, attributes):
+        self._tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.thread_id = threading.get_ident()
+        self.start = None
+        self.end = None
+
+    @property
+    def duration_ms(self):
+        if self.start is None or self.end is None:
+            return 0.0
+        return (self.end - self.start) * 1000
+
+    def set(self, **attributes):
+        """Attach extra attributes to the span."""
+        self.attributes.update(attributes)
+
+    def record_usage(self, response):
+        """Copy token counts from an OpenAI response's `usage` field, if present."""
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        for field in ("prompt_tokens", "completion_tokens", "total_tokens"):
+            value = getattr(usage, field, None)
+            if value is not None:
+                self.attributes[field] = value
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.end = time.perf_counter()
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+        self._tracer._finish(self)
+        return False
+
+
+class _NoopSpan:
+    """Stand-in returned when tracing is disabled."""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def record_usage(self, response):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Collects spans; disabled by default."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.spans = []
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+
+    def span(self, name, **attributes):
+        """Context manager timing the enclosed block."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return Span(self, name, attributes)
+
+    def _finish(self, span):
+        with self._lock:
+            self.spans.append(span)
+
+    def clear(self):
+        with self._lock:
+            self.spans = []
+
+    def stage_breakdown(self, spans=None):
+        """Aggregate spans (default: all) by name: count, total/mean duration and token totals."""
+        stages = {}
+        for span in list(self.spans if spans is None else spans):
+            stage = stages.setdefault(span.name, {"count": 0, "total_ms": 0.0, "tokens": 0})
+            stage["count"] += 1
+            stage["total_ms"] += span.duration_ms
+            stage["tokens"] += span.attributes.get("total_tokens", 0)
+        for stage in stages.values():
+            stage["mean_ms"] = stage["total_ms"] / stage["count"]
+        return stages
+
+    def print_profile(self, spans=None):
+        """Print the stage breakdown as a table, slowest stage first."""
+        stages = self.stage_breakdown(spans)
+        if not stages:
+            print("No spans recorded.")
+            return
+        print(f"\n{'Stage':<32} {'Count':>6} {'Total ms':>10} {'Mean ms':>9} {'Tokens':>8}")
+        print("-" * 69)
+        for name, stage in sorted(stages.items(), key=lambda s: s[1]["total_ms"], reverse=True):
+            print(f"{name:<32} {stage['count']:>6} {stage['total_ms']:>10.2f} "
+                  f"{stage['mean_ms']:>9.2f} {stage['tokens'] or '':>8}")
+
+    def export_jsonl(self, path):
+        """Write one JSON object per span."""
+        with open(path, 'w', encoding='utf-8') as f:
+            for span in list(self.spans):
+                f.write(json.dumps({
+                    "name": span.name,
+                    "start_ms": round((span.start - self._origin) * 1000, 3),
+                    "duration_ms": round(span.duration_ms, 3),
+                    "thread_id": span.thread_id,
+                    "attributes": span.attributes,
+                }, default=str) + "\n")
+        return path
+
+    def export_chrome(self, path):
+        """Write spans as Chrome trace 'complete' events."""
+        pid = os.getpid()
+        events = [{
+            "name": span.name,
+            "ph": "X",
+            "ts": round((span.start - self._origin) * 1_000_000, 1),
+            "dur": round(span.duration_ms * 1000, 1),
+            "pid": pid,
+            "tid": span.thread_id,
+            "args": span.attributes,
+        } for span in list(self.spans)]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+        return path
+
+    def export(self, path):
+        """Export by file extension: `.jsonl` for JSONL, anything else for Chrome trace."""
+        if path.endswith(".jsonl"):
+            return self.export_jsonl(path)
+        return self.export_chrome(path)